@@ -1,20 +1,47 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 import json
 import os
 import sys
+from functools import lru_cache
 from enhanced_predictor import EnhancedPredictor
 from data_loader import get_data_loader
+from goal_predictor import get_goal_predictor
 
 # Add parent directory to path for hybrid_team_selector import
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
 from src.models.hybrid_team_selector import run_hybrid_selection
 
+# orjson is optional - faster jsonify and native NumPy scalar support
+ORJSON_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Get the correct template folder path (TASK_6_Deployment/templates)
 current_dir = os.path.dirname(os.path.abspath(__file__))
 template_dir = os.path.join(current_dir, "..", "templates")
 static_dir = os.path.join(current_dir, "..", "static")
 
 app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 
 # Load teams data from scraped sources (FIFA rankings + player database)
 print("🔄 Loading FIFA 2026 data from scraped sources...")
@@ -22,10 +49,15 @@ data_loader = get_data_loader()
 all_teams_data = data_loader.get_48_teams_data()
 print(f"✅ Loaded {len(all_teams_data)} teams with real FIFA data!")
 
+# Load goal prediction models once at startup (shared by every request)
+goal_predictor = get_goal_predictor()
+
 # Run Hybrid Selection to select 8 quarter-finalist teams
+# (the matplotlib PNG is only regenerated for interactive runs, not server boots)
 print("\n🏆 Selecting Top 8 Quarter-Finalists by Performance Score...")
-finalist_teams, selection_info = run_hybrid_selection(all_teams_data, visualize=True)
+finalist_teams, selection_info = run_hybrid_selection(all_teams_data, visualize=sys.stdout.isatty())
 teams_data = finalist_teams  # Use only the 8 selected teams
+teams_by_name = {t['name']: t for t in teams_data}  # O(1) lookup by team name
 print(f"\n🎯 {len(teams_data)} quarter-finalist teams selected!")
 
 # DEBUG: Print team information
@@ -39,12 +71,11 @@ print()
 def home():
     return render_template('index_flask.html', teams=teams_data)
 
-@app.route('/get_selection_info', methods=['GET'])
-def get_selection_info():
+def _build_selection_info():
     """
-    Get top 8 selection analysis.
+    Serialize the top 8 selection analysis once (only changes on startup/refresh).
     """
-    return jsonify({
+    return json.dumps({
         'selection_method': 'Top 8 by Performance Score',
         'total_teams_analyzed': len(all_teams_data),
         'finalists_selected': len(teams_data),
@@ -60,7 +91,16 @@ def get_selection_info():
             for i, team in enumerate(teams_data)
         ],
         'visualization_available': os.path.exists(os.path.join(static_dir, 'hybrid_selection_visualization.png'))
-    })
+    }, separators=(',', ':'))
+
+SELECTION_INFO_BODY = _build_selection_info()
+
+@app.route('/get_selection_info', methods=['GET'])
+def get_selection_info():
+    """
+    Get top 8 selection analysis.
+    """
+    return Response(SELECTION_INFO_BODY, mimetype='application/json')
 
 @app.route('/predict', methods=['POST'])
 def predict():
@@ -70,8 +110,8 @@ def predict():
     match_type = data.get('match_type', 'group')  # Get match type from frontend
     
     # Find teams
-    team1 = next((t for t in teams_data if t['name'] == team1_name), None)
-    team2 = next((t for t in teams_data if t['name'] == team2_name), None)
+    team1 = teams_by_name.get(team1_name)
+    team2 = teams_by_name.get(team2_name)
     
     if not team1 or not team2:
         return jsonify({'error': 'Teams not found'}), 400
@@ -105,7 +145,7 @@ def refresh_data():
     Manual endpoint to refresh player data from web scraper
     """
     try:
-        global teams_data, data_loader
+        global teams_data, teams_by_name, data_loader, SELECTION_INFO_BODY
         
         print("\n Manual data refresh requested...")
         
@@ -115,6 +155,9 @@ def refresh_data():
         if success:
             # Reload teams data
             teams_data = data_loader.get_48_teams_data()
+            teams_by_name = {t['name']: t for t in teams_data}
+            SELECTION_INFO_BODY = _build_selection_info()
+            _player_stats.cache_clear()
             print(f" Refreshed! Loaded {len(teams_data)} teams\n")
             
             return jsonify({
@@ -135,6 +178,13 @@ def refresh_data():
             'error': str(e)
         }), 500
 
+@lru_cache(maxsize=64)
+def _player_stats(team_name):
+    """
+    Player stats for a team (FIFA 22 onwards), cached until the next data refresh
+    """
+    return data_loader.get_player_stats_for_team(team_name, min_year=2022)
+
 @app.route('/team-details/<team_name>', methods=['GET'])
 def team_details(team_name):
     """
@@ -142,13 +192,13 @@ def team_details(team_name):
     """
     try:
         # Find team in teams_data
-        team = next((t for t in teams_data if t['name'] == team_name), None)
+        team = teams_by_name.get(team_name)
         
         if not team:
             return jsonify({'error': 'Team not found'}), 404
         
         # Get player stats for this team (FIFA 22 onwards - year >= 2022)
-        player_stats = data_loader.get_player_stats_for_team(team_name, min_year=2022)
+        player_stats = _player_stats(team_name)
         
         response = {
             'team': team,
@@ -171,4 +221,5 @@ if __name__ == '__main__':
     print(" URL: http://localhost:5000")
     print("="*60)
     print("\n Press Ctrl+C to stop the server\n")
-    app.run(debug=True, port=5000, host='0.0.0.0')
+    # Development fallback only - production runs under gunicorn (see Procfile)
+    app.run(debug=False, port=5000, host='0.0.0.0')
@@ -4,7 +4,7 @@ Multi-factor comparison model for realistic predictions with goal prediction
 """
 
 import math
-from goal_predictor import GoalPredictor
+from goal_predictor import get_goal_predictor
 
 class EnhancedPredictor:
     """
@@ -209,8 +209,8 @@ class EnhancedPredictor:
         # Get win probability (existing method)
         win_prediction = EnhancedPredictor.calculate_win_probability(team1, team2)
         
-        # Create goal predictor instance (Random Forest needs initialization)
-        goal_predictor = GoalPredictor()
+        # Shared goal predictor (Random Forest is loaded once per process)
+        goal_predictor = get_goal_predictor()
         
         # Get goal prediction with SMART ROUNDING based on win probability!
         # Pass win probabilities so goals align with predicted winner
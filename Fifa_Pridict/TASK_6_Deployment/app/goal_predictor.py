@@ -4,10 +4,94 @@ Uses Random Forest Regression + Machine Learning methodology
 """
 
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-import pickle
+import joblib
 import os
+import math
+from functools import lru_cache
+
+# Numba is optional - fall back to the NumPy tree walker without it
+NUMBA_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Shared random generator for match simulations (PCG64, seeded once per process;
+# Generator methods hold the bit generator's lock, so threads can share it)
+_RNG = np.random.default_rng()
+
+
+def _flatten_forest(forest):
+    """
+    Stack the fitted trees of a RandomForestRegressor into padded
+    (n_trees, max_nodes) arrays so predictions skip sklearn's per-tree dispatch
+    
+    Returns:
+        tuple: (threshold, feature, children_left, children_right, value)
+    """
+    trees = [estimator.tree_ for estimator in forest.estimators_]
+    n_trees = len(trees)
+    max_nodes = max(tree.node_count for tree in trees)
+    
+    threshold = np.zeros((n_trees, max_nodes), dtype=np.float64)
+    feature = np.zeros((n_trees, max_nodes), dtype=np.intp)
+    children_left = np.full((n_trees, max_nodes), -1, dtype=np.intp)
+    children_right = np.full((n_trees, max_nodes), -1, dtype=np.intp)
+    value = np.zeros((n_trees, max_nodes), dtype=np.float64)
+    
+    for t, tree in enumerate(trees):
+        n = tree.node_count
+        threshold[t, :n] = tree.threshold
+        feature[t, :n] = np.maximum(tree.feature, 0)  # Leaves use -2, keep index valid
+        children_left[t, :n] = tree.children_left
+        children_right[t, :n] = tree.children_right
+        value[t, :n] = tree.value[:, 0, 0]
+    
+    return threshold, feature, children_left, children_right, value
+
+
+def _forest_predict_numpy(X, threshold, feature, children_left, children_right, value):
+    """Walk every (row, tree) pair at once, one depth level per NumPy step"""
+    trees = np.arange(threshold.shape[0])[np.newaxis, :]
+    rows = np.arange(X.shape[0])[:, np.newaxis]
+    node = np.zeros((X.shape[0], threshold.shape[0]), dtype=np.intp)
+    
+    while True:
+        left = children_left[trees, node]
+        internal = left != -1
+        if not internal.any():
+            break
+        go_left = X[rows, feature[trees, node]] <= threshold[trees, node]
+        node = np.where(internal, np.where(go_left, left, children_right[trees, node]), node)
+    
+    return value[trees, node].mean(axis=1)
+
+
+if NUMBA_AVAILABLE:
+    # nogil lets other gunicorn/Flask threads run while a prediction is scored;
+    # parallel=True is deliberately off - thread dispatch outweighs a 2-row batch
+    @njit(cache=True, nogil=True)
+    def _forest_predict(X, threshold, feature, children_left, children_right, value):
+        """Compiled tree walker: average leaf value over all trees for each row"""
+        n_trees = threshold.shape[0]
+        predictions = np.zeros(X.shape[0])
+        
+        # Trees outer, rows inner: each tree's arrays are read once for the whole batch
+        for t in range(n_trees):
+            for i in range(X.shape[0]):
+                node = 0
+                while children_left[t, node] != -1:
+                    if X[i, feature[t, node]] <= threshold[t, node]:
+                        node = children_left[t, node]
+                    else:
+                        node = children_right[t, node]
+                predictions[i] += value[t, node]
+        
+        return predictions / n_trees
+else:
+    _forest_predict = _forest_predict_numpy
+
 
 class GoalPredictor:
     """
@@ -27,12 +111,22 @@ class GoalPredictor:
         'final': 0.82
     }
     
+    # Team fields (with defaults) that feed the regression features
+    FEATURE_FIELDS = (('score', 0.75), ('avg_overall', 70), ('rank', 50))
+    
     def __init__(self):
         """Initialize the goal predictor with trained models"""
         self.team1_goals_model = None
         self.team2_goals_model = None
-        self.scaler = StandardScaler()
+        self.scaler = None
         self.is_trained = False
+        self._forest_arrays = None
+        self._mean = None
+        self._scale = None
+        
+        # Memoized xG pairs and scoreline simulations (pure given team stats / xG)
+        self._xg_cache = lru_cache(maxsize=256)(self._compute_xg)
+        self._scoreline_cache = lru_cache(maxsize=256)(self._simulate_scoreline_probabilities)
         
         # Try to load pre-trained models
         self._load_models()
@@ -50,41 +144,61 @@ class GoalPredictor:
         
         try:
             if os.path.exists(team1_model_path) and os.path.exists(team2_model_path):
-                with open(team1_model_path, 'rb') as f:
-                    self.team1_goals_model = pickle.load(f)
-                with open(team2_model_path, 'rb') as f:
-                    self.team2_goals_model = pickle.load(f)
+                # Memory-map model arrays read-only (shared across forked workers);
+                # plain pickle files from older saves load the same way
+                self.team1_goals_model = joblib.load(team1_model_path, mmap_mode='r')
+                self.team2_goals_model = joblib.load(team2_model_path, mmap_mode='r')
                 if os.path.exists(scaler_path):
-                    with open(scaler_path, 'rb') as f:
-                        self.scaler = pickle.load(f)
+                    self.scaler = joblib.load(scaler_path, mmap_mode='r')
+                self._prepare_inference()
                 self.is_trained = True
                 print(" Loaded pre-trained goal prediction models")
         except Exception as e:
             print(f" Could not load models: {e}")
             self.is_trained = False
     
+    def _prepare_inference(self):
+        """Capture scaler statistics and flattened forest arrays for fast prediction"""
+        self._mean = np.asarray(self.scaler.mean_, dtype=np.float32)
+        self._scale = np.asarray(self.scaler.scale_, dtype=np.float32)
+        self._forest_arrays = _flatten_forest(self.team1_goals_model)
+        self._xg_cache.cache_clear()
+        self._scoreline_cache.cache_clear()
+    
     def _train_models(self):
         """
         Train Random Forest models on synthetic data based on team statistics
         In production, this would use historical match results
+        
+        Only runs when ALLOW_TRAIN=1 so servers never train during cold start
         """
+        if os.environ.get('ALLOW_TRAIN') != '1':
+            raise RuntimeError(
+                "Goal prediction models not found in TASK_3_Model_Building/models. "
+                "Set ALLOW_TRAIN=1 to train them."
+            )
+        
+        # sklearn is only needed for training (loading resolves its own classes)
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.preprocessing import StandardScaler
+        
         print(" Training goal prediction models...")
         
         # Generate synthetic training data based on realistic patterns
         # Features: [attack_performance, defense_performance, performance_diff, avg_overall, rank_advantage]
-        np.random.seed(42)
+        rng = np.random.default_rng(42)  # Local generator - never touch global NumPy state
         n_samples = 1000
         
         # Simulate realistic team performance scores (0.5 to 0.95 like real teams)
-        attack_performances = np.random.uniform(0.5, 0.95, n_samples)
-        defense_performances = np.random.uniform(0.5, 0.95, n_samples)
+        attack_performances = rng.uniform(0.5, 0.95, n_samples)
+        defense_performances = rng.uniform(0.5, 0.95, n_samples)
         
         # Calculate performance differences (KEY for alignment with win probability!)
         performance_diffs = (attack_performances - defense_performances) * 100
         
         # Other features
-        avg_overalls = np.random.uniform(60, 85, n_samples)
-        rank_advantages = np.random.uniform(-50, 50, n_samples)
+        avg_overalls = rng.uniform(60, 85, n_samples)
+        rank_advantages = rng.uniform(-50, 50, n_samples)
         
         X = np.column_stack([
             attack_performances * 100,  # 50-95 scale
@@ -96,60 +210,47 @@ class GoalPredictor:
         
         # Generate target goals ALIGNED WITH PERFORMANCE SCORES
         # Higher performance score = more goals (matches win probability logic!)
-        y_team1 = []
-        y_team2 = []
         
-        for i in range(n_samples):
-            attack_perf = attack_performances[i]
-            defense_perf = defense_performances[i]
-            perf_diff = performance_diffs[i]
-            
-            # Base expected goals from performance scores
-            # 0.5 performance -> 1.25 goals, 0.95 performance -> 2.375 goals
-            base_attack_goals = attack_perf * 2.5
-            base_defense_goals = defense_perf * 2.5
-            
-            # Adjust based on performance difference (same logic as win probability!)
-            if perf_diff > 20:  # Strong attacker vs weak defender
-                team1_expected = base_attack_goals * 1.4  # Boost attacker
-                team2_expected = base_defense_goals * 0.6  # Reduce defender
-            elif perf_diff < -20:  # Weak attacker vs strong defender
-                team1_expected = base_attack_goals * 0.6  # Reduce attacker
-                team2_expected = base_defense_goals * 1.4  # Boost defender
-            else:  # Evenly matched
-                team1_expected = base_attack_goals
-                team2_expected = base_defense_goals
-            
-            # Add randomness but keep realistic (0-5 goals)
-            team1_goals = np.clip(team1_expected + np.random.normal(0, 0.6), 0, 5)
-            team2_goals = np.clip(team2_expected + np.random.normal(0, 0.6), 0, 5)
-            
-            y_team1.append(team1_goals)
-            y_team2.append(team2_goals)
+        # Base expected goals from performance scores
+        # 0.5 performance -> 1.25 goals, 0.95 performance -> 2.375 goals
+        base_attack_goals = attack_performances * 2.5
+        base_defense_goals = defense_performances * 2.5
+        
+        # Adjust based on performance difference (same logic as win probability!)
+        # Strong attacker vs weak defender (> 20): boost attacker, reduce defender
+        # Weak attacker vs strong defender (< -20): reduce attacker, boost defender
+        # Evenly matched: no adjustment
+        team1_multiplier = np.where(performance_diffs > 20, 1.4, np.where(performance_diffs < -20, 0.6, 1.0))
+        team2_multiplier = np.where(performance_diffs > 20, 0.6, np.where(performance_diffs < -20, 1.4, 1.0))
         
-        y_team1 = np.array(y_team1)
-        y_team2 = np.array(y_team2)
+        # Add randomness but keep realistic (0-5 goals)
+        y_team1 = np.clip(base_attack_goals * team1_multiplier + rng.normal(0, 0.6, n_samples), 0, 5)
+        y_team2 = np.clip(base_defense_goals * team2_multiplier + rng.normal(0, 0.6, n_samples), 0, 5)
         
         # Scale features
+        self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(X)
         
         # Train models
         self.team1_goals_model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=10,
+            n_estimators=25,  # 5 features, 3 target regimes - a small forest is enough
+            max_depth=6,
             min_samples_split=5,
-            random_state=42
+            random_state=42,
+            n_jobs=-1  # Build trees on all cores
         )
         self.team2_goals_model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=10,
+            n_estimators=25,  # 5 features, 3 target regimes - a small forest is enough
+            max_depth=6,
             min_samples_split=5,
-            random_state=42
+            random_state=42,
+            n_jobs=-1  # Build trees on all cores
         )
         
         self.team1_goals_model.fit(X_scaled, y_team1)
         self.team2_goals_model.fit(X_scaled, y_team2)
         
+        self._prepare_inference()
         self.is_trained = True
         print(" Goal prediction models trained successfully")
         
@@ -162,12 +263,10 @@ class GoalPredictor:
             model_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'TASK_3_Model_Building', 'models')
             os.makedirs(model_dir, exist_ok=True)
             
-            with open(os.path.join(model_dir, 'goal_prediction_team1.pkl'), 'wb') as f:
-                pickle.dump(self.team1_goals_model, f)
-            with open(os.path.join(model_dir, 'goal_prediction_team2.pkl'), 'wb') as f:
-                pickle.dump(self.team2_goals_model, f)
-            with open(os.path.join(model_dir, 'goal_prediction_scaler.pkl'), 'wb') as f:
-                pickle.dump(self.scaler, f)
+            # Uncompressed so _load_models can memory-map the arrays
+            joblib.dump(self.team1_goals_model, os.path.join(model_dir, 'goal_prediction_team1.pkl'), compress=0)
+            joblib.dump(self.team2_goals_model, os.path.join(model_dir, 'goal_prediction_team2.pkl'), compress=0)
+            joblib.dump(self.scaler, os.path.join(model_dir, 'goal_prediction_scaler.pkl'), compress=0)
             print(" Goal prediction models saved")
         except Exception as e:
             print(f" Could not save models: {e}")
@@ -209,7 +308,52 @@ class GoalPredictor:
             performance_advantage,     # Performance difference (-100 to +100)
             avg_overall_attack,        # Squad quality
             rank_advantage             # Rank advantage
-        ]])
+        ]], dtype=np.float32)
+    
+    def _team_key(self, team):
+        """Hashable tuple of the team stats used as features"""
+        return tuple(team.get(field, default) for field, default in self.FEATURE_FIELDS)
+    
+    def _predict_xg(self, team1, team2, match_type='group'):
+        """
+        Predict expected goals for both teams (no rounding, no simulation)
+        
+        Cached on the teams' feature stats + match type, so back-to-back calls
+        for the same pair (score, scorelines, over/under) compute xG once
+        
+        Returns:
+            tuple: (team1_xG, team2_xG)
+        """
+        return self._xg_cache(self._team_key(team1), self._team_key(team2), match_type)
+    
+    def _compute_xg(self, team1_key, team2_key, match_type):
+        """Uncached xG computation behind _predict_xg"""
+        fields = [field for field, _ in self.FEATURE_FIELDS]
+        team1 = dict(zip(fields, team1_key))
+        team2 = dict(zip(fields, team2_key))
+        
+        if not self.is_trained:
+            self._train_models()
+        
+        # Extract features for both teams AS ATTACKERS, stacked into one batch
+        X = np.vstack([
+            self._extract_features(team1, team2),
+            self._extract_features(team2, team1)
+        ])
+        
+        # Scale features (same as StandardScaler.transform, minus input validation)
+        X_scaled = (X - self._mean) / self._scale
+        
+        # Predict goals by walking the flattened Random Forest in a single call
+        # Use team1_goals_model for BOTH (since features are from attacker's perspective)
+        # Features stay float32, the dtype sklearn's trees split on
+        xG_raw = _forest_predict(X_scaled, *self._forest_arrays)
+        
+        # Apply match type multiplier and clip both teams to 0.1-5.0 in one step
+        multiplier = self.MATCH_MULTIPLIERS.get(match_type, 1.0)
+        team1_xG, team2_xG = np.clip(xG_raw * multiplier, 0.1, 5.0).tolist()
+        
+        return team1_xG, team2_xG
     
     def predict_match_score(self, team1, team2, match_type='group', team1_win_prob=None, team2_win_prob=None):
         """
@@ -233,26 +377,7 @@ class GoalPredictor:
                 'goal_breakdown': dict
             }
         """
-        if not self.is_trained:
-            self._train_models()
-        
-        # Extract features for both teams AS ATTACKERS
-        team1_attacking_features = self._extract_features(team1, team2)
-        team2_attacking_features = self._extract_features(team2, team1)
-        
-        # Scale features
-        team1_features_scaled = self.scaler.transform(team1_attacking_features)
-        team2_features_scaled = self.scaler.transform(team2_attacking_features)
-        
-        # Predict goals using Random Forest
-        # Use team1_goals_model for BOTH (since features are from attacker's perspective)
-        team1_xG_raw = self.team1_goals_model.predict(team1_features_scaled)[0]
-        team2_xG_raw = self.team1_goals_model.predict(team2_features_scaled)[0]  # Use same model!
-        
-        # Apply match type multiplier
-        multiplier = self.MATCH_MULTIPLIERS.get(match_type, 1.0)
-        team1_xG = max(0.1, min(5.0, team1_xG_raw * multiplier))
-        team2_xG = max(0.1, min(5.0, team2_xG_raw * multiplier))
+        team1_xG, team2_xG = self._predict_xg(team1, team2, match_type)
         
         # SMART ROUNDING based on win probability!
         # Winner (higher win prob) → Round UP (ceiling)
@@ -279,9 +404,6 @@ class GoalPredictor:
         team1_goals = max(0, team1_goals)
         team2_goals = max(0, team2_goals)
         
-        # Calculate alternative scoreline probabilities (simulation-based)
-        scoreline_probs = self._simulate_scoreline_probabilities(team1_xG, team2_xG)
-        
         return {
             'team1_goals': team1_goals,
             'team2_goals': team2_goals,
@@ -295,43 +417,50 @@ class GoalPredictor:
             }
         }
     
-    def _simulate_scoreline_probabilities(self, team1_xG, team2_xG, n_simulations=1000):
+    def _simulate_scoreline_probabilities(self, team1_xG, team2_xG, n_simulations=1000, rng=None):
         """
         Simulate match outcomes to get scoreline probabilities
+        
+        Args:
+            rng: Optional numpy Generator for reproducible runs (defaults to the shared one)
         """
-        np.random.seed(None)  # Random seed for variety
+        if rng is None:
+            rng = _RNG
         
-        scorelines = {}
-        for _ in range(n_simulations):
-            # Add randomness around xG predictions
-            g1 = max(0, int(round(np.random.normal(team1_xG, 0.8))))
-            g2 = max(0, int(round(np.random.normal(team2_xG, 0.8))))
-            
-            # Cap at realistic maximum
-            g1 = min(g1, 5)
-            g2 = min(g2, 5)
-            
-            score = f"{g1}-{g2}"
-            scorelines[score] = scorelines.get(score, 0) + 1
+        # One vectorized draw for all simulations (columns: team1, team2)
+        loc = np.array([team1_xG, team2_xG], dtype=np.float32)
+        draws = rng.standard_normal((n_simulations, 2), dtype=np.float32) * np.float32(0.8) + loc
+        
+        # Round to whole goals, capped at realistic range 0-5
+        goals = np.clip(np.rint(draws), 0, 5).astype(np.int8)
+        
+        # Tally scorelines in 6x6 buckets (index = g1 * 6 + g2)
+        counts = np.bincount(goals[:, 0] * 6 + goals[:, 1], minlength=36)
         
-        # Convert counts to probabilities
-        total = sum(scorelines.values())
-        return {k: (v / total) * 100 for k, v in scorelines.items()}
+        # Convert non-zero counts to probabilities
+        return {
+            f"{idx // 6}-{idx % 6}": (counts[idx] / n_simulations) * 100
+            for idx in np.flatnonzero(counts)
+        }
     
-    def predict_score_probabilities(self, team1, team2, match_type='group'):
+    def predict_score_probabilities(self, team1, team2, match_type='group', rng=None):
         """
         Calculate probabilities for different scorelines using simulation
         
+        Args:
+            rng: Optional numpy Generator, e.g. np.random.default_rng(seed) for repeatable output
+            
         Returns:
             list: Top 5 most likely scorelines with probabilities
         """
         # Get xG predictions
-        prediction = self.predict_match_score(team1, team2, match_type)
-        team1_xG = prediction['team1_xG']
-        team2_xG = prediction['team2_xG']
+        team1_xG, team2_xG = self._predict_xg(team1, team2, match_type)
         
         # Simulate scorelines
-        scoreline_probs = self._simulate_scoreline_probabilities(team1_xG, team2_xG, n_simulations=2000)
+        if rng is None:
+            scoreline_probs = self._scoreline_cache(team1_xG, team2_xG, 2000)
+        else:
+            scoreline_probs = self._simulate_scoreline_probabilities(team1_xG, team2_xG, n_simulations=2000, rng=rng)
         
         # Sort by probability
         sorted_scorelines = sorted(
@@ -342,9 +471,21 @@ class GoalPredictor:
         
         return sorted_scorelines[:5]
     
+    @staticmethod
+    def _goal_pmf(xG, max_goals=10):
+        """
+        Probability of each goal count for one team: max(0, round(N(xG, 0.8)))
+        
+        Returns:
+            numpy array: P(goals = k) for k = 0..max_goals (last entry holds the tail)
+        """
+        edges = np.arange(max_goals) + 0.5
+        cdf = [0.5 * (1 + math.erf((edge - xG) / (0.8 * math.sqrt(2)))) for edge in edges]
+        return np.diff(cdf, prepend=0.0, append=1.0)
+    
     def get_over_under_probability(self, team1, team2, threshold=2.5, match_type='group'):
         """
-        Calculate probability of over/under total goals using simulation
+        Calculate probability of over/under total goals (closed form)
         
         Args:
             threshold: Goal threshold (e.g., 2.5 means over 2.5 or under 2.5)
@@ -353,23 +494,14 @@ class GoalPredictor:
             dict: {'over': float, 'under': float}
         """
         # Get xG predictions
-        prediction = self.predict_match_score(team1, team2, match_type)
-        total_xG = prediction['team1_xG'] + prediction['team2_xG']
-        
-        # Simulate total goals
-        np.random.seed(None)
-        simulations = 2000
-        over_count = 0
-        
-        for _ in range(simulations):
-            g1 = max(0, int(round(np.random.normal(prediction['team1_xG'], 0.8))))
-            g2 = max(0, int(round(np.random.normal(prediction['team2_xG'], 0.8))))
-            total = min(g1 + g2, 10)  # Cap at 10
-            
-            if total > threshold:
-                over_count += 1
+        team1_xG, team2_xG = self._predict_xg(team1, team2, match_type)
+        total_xG = team1_xG + team2_xG
+        
+        # Exact total-goals distribution: convolve both teams' goal PMFs
+        total_pmf = np.convolve(self._goal_pmf(team1_xG), self._goal_pmf(team2_xG))
+        totals = np.minimum(np.arange(total_pmf.size), 10)  # Cap at 10
         
-        over_prob = (over_count / simulations) * 100
+        over_prob = float(total_pmf[totals > threshold].sum()) * 100
         under_prob = 100 - over_prob
         
         return {
@@ -380,12 +512,25 @@ class GoalPredictor:
         }
 
 
+# Singleton instance
+_goal_predictor = None
+
+def get_goal_predictor():
+    """
+    Get or create the goal predictor singleton (models are loaded once per process)
+    """
+    global _goal_predictor
+    if _goal_predictor is None:
+        _goal_predictor = GoalPredictor()
+    return _goal_predictor
+
+
 if __name__ == "__main__":
     # Test the goal predictor
     print("🎯 Goal Prediction System Test (Random Forest Regression)\n")
     
     # Create predictor instance
-    predictor = GoalPredictor()
+    predictor = get_goal_predictor()
     
     # Example teams
     argentina = {
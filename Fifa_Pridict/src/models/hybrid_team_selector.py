@@ -1,33 +1,64 @@
 """
 Hybrid Team Selection for FIFA World Cup 2026 Quarter-Finals
 
-This module combines performance-based selection with K-Means clustering to select
-8 quarter-finalist teams that are both realistic AND geographically diverse.
+This module selects the 8 quarter-finalist teams by performance score and
+reports their confederation distribution.
 
 Strategy:
-- Top 5 teams by performance score (ensures favorites are included)
-- Best 3 teams from remaining confederations via K-Means clustering
+- Top 8 teams by performance score (ensures favorites are included)
 """
 
 import numpy as np
-import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import silhouette_score
+import hashlib
+import html
 import json
+import logging
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+logger = logging.getLogger(__name__)
+
+# Flask static folder (TASK_6_Deployment/static), resolved once at import
+_STATIC_DIR = Path(__file__).resolve().parent.parent.parent / 'TASK_6_Deployment' / 'static'
+
+# orjson is optional - much faster indented JSON output than the stdlib encoder
+ORJSON_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _write_json(path: Path, obj, pretty: bool = True) -> None:
+    """
+    Write obj to path as UTF-8 JSON (orjson when available).
+    
+    Args:
+        path: Destination file
+        obj: JSON-serializable object
+        pretty: Indent the output; False writes compact JSON
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        path.write_bytes(orjson.dumps(obj, option=option))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            if pretty:
+                json.dump(obj, f, indent=2, ensure_ascii=False)
+            else:
+                json.dump(obj, f, ensure_ascii=False, separators=(',', ':'))
 
 
 class HybridTeamSelector:
     """
-    Selects 8 quarter-finalist teams using hybrid approach:
-    - Top 5 by performance score (realistic favorites)
-    - Best 3 from remaining confederations via clustering (diversity)
+    Selects 8 quarter-finalist teams:
+    - Top 8 by performance score (realistic favorites)
     """
     
     def __init__(self, teams_data: List[Dict]):
@@ -38,12 +69,55 @@ class HybridTeamSelector:
             teams_data: List of all team dictionaries
         """
         self.all_teams = teams_data
-        self.top_5_teams = []
-        self.remaining_teams = []
-        self.clustered_3_teams = []
+        
+        # Normalize once: 'score' falls back to 'performance_score', and a missing
+        # confederation becomes an interned 'Unknown' so later code can index directly
+        for team in teams_data:
+            if 'score' not in team:
+                team['score'] = team.get('performance_score', 0.0)
+            team['confederation'] = sys.intern(team.get('confederation') or 'Unknown')
+        
+        # Scores as a flat array; ranking works on indices into all_teams
+        self._scores = np.fromiter((team['score'] for team in teams_data),
+                                   dtype=np.float64, count=len(teams_data))
+        
         self.final_8_teams = []
-        self.scaler = StandardScaler()
         
+    def _top_teams(self, k: int) -> List[Dict]:
+        """
+        Get the k highest-scoring teams without sorting the whole list.
+        
+        Args:
+            k: Number of teams to return
+            
+        Returns:
+            Top k team dictionaries, best first (ties keep input order)
+        """
+        neg = -self._scores
+        if k <= 0:
+            return []
+        if k >= len(neg):
+            order = np.argsort(neg, kind='stable')
+        else:
+            # O(n) partition finds the k-th best score; only teams at or above it get sorted
+            kth = np.partition(neg, k - 1)[k - 1]
+            candidates = np.flatnonzero(neg <= kth)
+            order = candidates[np.argsort(neg[candidates], kind='stable')][:k]
+        return [self.all_teams[i] for i in order]
+    
+    @staticmethod
+    def _conf_histogram(teams: List[Dict]) -> Counter:
+        """
+        Count teams per confederation.
+        
+        Args:
+            teams: List of team dictionaries
+            
+        Returns:
+            Counter mapping confederation -> number of teams
+        """
+        return Counter(team['confederation'] for team in teams)
+    
     def select_quarter_finalists(self) -> List[Dict]:
         """
         Main method to select 8 quarter-finalist teams.
@@ -51,17 +125,11 @@ class HybridTeamSelector:
         Returns:
             List of 8 selected team dictionaries
         """
-        print(f"\n🎯 Top 8 Quarter-Final Team Selection")
-        print(f"📊 Analyzing {len(self.all_teams)} teams...")
+        logger.info("🎯 Top 8 Quarter-Final Team Selection")
+        logger.info("📊 Analyzing %d teams...", len(self.all_teams))
         
         # Simple: Just take top 8 by performance score
-        sorted_teams = sorted(
-            self.all_teams,
-            key=lambda x: x.get('score', x.get('performance_score', 0)),
-            reverse=True
-        )
-        
-        self.final_8_teams = sorted_teams[:8]
+        self.final_8_teams = self._top_teams(8)
         
         # Add metadata
         for i, team in enumerate(self.final_8_teams, 1):
@@ -69,148 +137,20 @@ class HybridTeamSelector:
             team['selection_rank'] = i
             team['final_rank'] = i
         
-        print(f"\n🏆 Top 8 Teams Selected (by Performance Score):")
-        for i, team in enumerate(self.final_8_teams, 1):
-            score = team.get('score', team.get('performance_score', 0))
-            conf = team.get('confederation', 'Unknown')
-            print(f"   {i}. {team['name']} ({conf}) - Score: {score:.3f}")
-        
-        # Print confederation distribution
-        print(f"\n📊 Confederation Distribution:")
-        conf_count = {}
-        for team in self.final_8_teams:
-            conf = team.get('confederation', 'Unknown')
-            conf_count[conf] = conf_count.get(conf, 0) + 1
-        
-        for conf, count in sorted(conf_count.items(), key=lambda x: x[1], reverse=True):
-            print(f"   {conf}: {count} team(s)")
-        
-        return self.final_8_teams
-    
-    def _select_top_5_by_performance(self):
-        """
-        Select top 5 teams by performance score.
-        Ensures the strongest teams (Argentina, Brazil, France, Spain, England) are included.
-        """
-        # Sort by performance score (use 'score' or 'performance_score')
-        sorted_teams = sorted(
-            self.all_teams,
-            key=lambda x: x.get('score', x.get('performance_score', 0)),
-            reverse=True
-        )
-        
-        self.top_5_teams = sorted_teams[:5]
-        
-        print(f"\n✅ Top 5 Teams Selected (by Performance Score):")
-        for i, team in enumerate(self.top_5_teams, 1):
-            score = team.get('score', team.get('performance_score', 0))
-            conf = team.get('confederation', 'Unknown')
-            print(f"   {i}. {team['name']} ({conf}) - Score: {score:.3f}")
-    
-    def _get_remaining_teams(self):
-        """
-        Get teams not in top 5 for clustering-based selection.
-        """
-        top_5_names = {team['name'] for team in self.top_5_teams}
-        self.remaining_teams = [
-            team for team in self.all_teams 
-            if team['name'] not in top_5_names
-        ]
-        print(f"\n📋 Remaining teams for clustering: {len(self.remaining_teams)}")
-    
-    def _select_best_3_from_clustering(self):
-        """
-        Use K-Means clustering to select best team from CAF, AFC, and CONCACAF.
-        Ensures geographic diversity in the final 8.
-        """
-        # Group remaining teams by confederation
-        conf_teams = {}
-        for team in self.remaining_teams:
-            conf = team.get('confederation', 'Unknown')
-            if conf not in conf_teams:
-                conf_teams[conf] = []
-            conf_teams[conf].append(team)
-        
-        print(f"\n🌍 Selecting best from each confederation:")
-        
-        # Target confederations (those not already in top 5)
-        target_confs = ['CAF', 'AFC', 'CONCACAF']
-        
-        for conf in target_confs:
-            if conf in conf_teams and len(conf_teams[conf]) > 0:
-                # Select best team from this confederation
-                best_team = max(
-                    conf_teams[conf],
-                    key=lambda x: x.get('score', x.get('performance_score', 0))
-                )
-                self.clustered_3_teams.append(best_team)
-                
-                score = best_team.get('score', best_team.get('performance_score', 0))
-                print(f"   ✓ {conf}: {best_team['name']} - Score: {score:.3f}")
-            else:
-                print(f"   ✗ {conf}: No teams available")
-        
-        # If we don't have 3 teams yet, fill with next best from any confederation
-        while len(self.clustered_3_teams) < 3:
-            selected_names = {team['name'] for team in self.top_5_teams + self.clustered_3_teams}
-            available = [t for t in self.remaining_teams if t['name'] not in selected_names]
+        # Report selection and confederation distribution (skipped when INFO is off)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🏆 Top 8 Teams Selected (by Performance Score):")
+            for i, team in enumerate(self.final_8_teams, 1):
+                logger.info("   %d. %s (%s) - Score: %.3f",
+                            i, team['name'], team['confederation'], team['score'])
             
-            if not available:
-                break
+            logger.info("📊 Confederation Distribution:")
+            conf_count = self._conf_histogram(self.final_8_teams)
             
-            next_best = max(
-                available,
-                key=lambda x: x.get('score', x.get('performance_score', 0))
-            )
-            self.clustered_3_teams.append(next_best)
-            
-            score = next_best.get('score', next_best.get('performance_score', 0))
-            conf = next_best.get('confederation', 'Unknown')
-            print(f"   ✓ Fallback: {next_best['name']} ({conf}) - Score: {score:.3f}")
-    
-    def _finalize_selection(self):
-        """
-        Combine top 5 and clustered 3 to create final 8 teams.
-        Add metadata for tracking selection method.
-        """
-        # Add selection method to each team
-        for team in self.top_5_teams:
-            team['selection_method'] = 'Top 5 Performance'
-            team['selection_rank'] = self.top_5_teams.index(team) + 1
-        
-        for team in self.clustered_3_teams:
-            team['selection_method'] = 'Best from Confederation'
-            team['selection_rank'] = len(self.top_5_teams) + self.clustered_3_teams.index(team) + 1
-        
-        # Combine
-        self.final_8_teams = self.top_5_teams + self.clustered_3_teams
+            for conf, count in conf_count.most_common():
+                logger.info("   %s: %d team(s)", conf, count)
         
-        # Sort by performance score for final ranking
-        self.final_8_teams.sort(
-            key=lambda x: x.get('score', x.get('performance_score', 0)),
-            reverse=True
-        )
-        
-        # Update final rankings
-        for i, team in enumerate(self.final_8_teams, 1):
-            team['final_rank'] = i
-        
-        print(f"\n🏆 Final 8 Quarter-Finalist Teams:")
-        for i, team in enumerate(self.final_8_teams, 1):
-            score = team.get('score', team.get('performance_score', 0))
-            conf = team.get('confederation', 'Unknown')
-            method = team.get('selection_method', 'Unknown')
-            print(f"   {i}. {team['name']} ({conf}) - Score: {score:.3f} [{method}]")
-        
-        # Print confederation distribution
-        print(f"\n📊 Confederation Distribution:")
-        conf_count = {}
-        for team in self.final_8_teams:
-            conf = team.get('confederation', 'Unknown')
-            conf_count[conf] = conf_count.get(conf, 0) + 1
-        
-        for conf, count in sorted(conf_count.items(), key=lambda x: x[1], reverse=True):
-            print(f"   {conf}: {count} team(s)")
+        return self.final_8_teams
     
     def visualize_selection(self, output_path: str = None) -> str:
         """
@@ -222,19 +162,37 @@ class HybridTeamSelector:
         Returns:
             Path to saved visualization
         """
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+        if output_path is None:
+            output_path = 'static/hybrid_selection_visualization.png'
+        
+        # The chart is fully determined by the top 20 teams (top 8 highlighted):
+        # skip matplotlib entirely when the saved PNG was rendered from the same input
+        top_20_teams = self._top_teams(20)
+        chart_key = hashlib.blake2b(json.dumps(
+            [(t['name'], t['score'], t['confederation']) for t in top_20_teams]
+        ).encode('utf-8')).hexdigest()
+        key_path = Path(f"{output_path}.sha")
+        pie_path = Path(output_path).with_name(f"{Path(output_path).stem}_confederations.svg")
+        
+        if (Path(output_path).exists() and pie_path.exists() and key_path.exists()
+                and key_path.read_text() == chart_key):
+            logger.info("✅ Visualization unchanged, reusing %s", output_path)
+            return output_path
         
-        # Left plot: Performance scores of top 20 teams with top 8 highlighted
+        # Imported lazily: pyplot is only needed when the chart is re-rendered
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
+        fig, ax = plt.subplots(figsize=(8, 8))
+        
+        # Performance scores of top 20 teams with top 8 highlighted
         all_scores = []
         all_names = []
         colors = []
         
-        sorted_teams = sorted(self.all_teams, 
-                            key=lambda x: x.get('score', x.get('performance_score', 0)), 
-                            reverse=True)
-        
-        for i, team in enumerate(sorted_teams[:20]):
-            score = team.get('score', team.get('performance_score', 0))
+        for i, team in enumerate(top_20_teams):
+            score = team['score']
             all_scores.append(score)
             all_names.append(team['name'])
             
@@ -243,107 +201,163 @@ class HybridTeamSelector:
             else:
                 colors.append('#95a5a6')  # Gray for others
         
-        ax1.barh(range(len(all_names)), all_scores, color=colors)
-        ax1.set_yticks(range(len(all_names)))
-        ax1.set_yticklabels(all_names, fontsize=9)
-        ax1.set_xlabel('Performance Score', fontsize=11, fontweight='bold')
-        ax1.set_title('Team Performance Scores\n🟢 Top 8 Quarter-Finalists', 
+        ax.barh(range(len(all_names)), all_scores, color=colors)
+        ax.set_yticks(range(len(all_names)))
+        ax.set_yticklabels(all_names, fontsize=9)
+        ax.set_xlabel('Performance Score', fontsize=11, fontweight='bold')
+        ax.set_title('Team Performance Scores\nTop 8 Quarter-Finalists (green)', 
                      fontsize=12, fontweight='bold')
-        ax1.grid(axis='x', alpha=0.3, linestyle='--')
-        ax1.invert_yaxis()
-        
-        # Right plot: Confederation distribution
-        conf_distribution = {}
-        for team in self.final_8_teams:
-            conf = team.get('confederation', 'Unknown')
-            conf_distribution[conf] = conf_distribution.get(conf, 0) + 1
-        
-        confederations = list(conf_distribution.keys())
-        counts = list(conf_distribution.values())
-        colors_pie = ['#3498db', '#e74c3c', '#f39c12', '#9b59b6', '#1abc9c', '#34495e']
-        
-        wedges, texts, autotexts = ax2.pie(
-            counts,
-            labels=confederations,
-            autopct='%1.0f',
-            startangle=90,
-            colors=colors_pie[:len(confederations)],
-            textprops={'fontsize': 11, 'fontweight': 'bold'}
-        )
+        ax.grid(axis='x', alpha=0.3, linestyle='--')
+        ax.invert_yaxis()
         
-        ax2.set_title('Confederation Distribution\n(Top 8 Quarter-Finalists)', 
-                     fontsize=12, fontweight='bold')
+        plt.tight_layout()
         
-        # Add legend with team names
-        legend_labels = []
-        for conf in confederations:
-            teams_in_conf = [t['name'] for t in self.final_8_teams 
-                           if t.get('confederation') == conf]
-            legend_labels.append(f"{conf}: {', '.join(teams_in_conf)}")
+        # Save visualization (96 dpi is plenty for web display)
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        plt.savefig(output_path, dpi=96, bbox_inches='tight')
+        plt.close()
         
-        ax2.legend(legend_labels, loc='center left', bbox_to_anchor=(1, 0, 0.5, 1), 
-                  fontsize=9, framealpha=0.9)
+        # Confederation distribution is a small pie: emit SVG directly, no rasterizing
+        pie_path.write_text(self._render_pie_svg(self._conf_histogram(self.final_8_teams)), encoding='utf-8')
+        key_path.write_text(chart_key)
         
-        plt.suptitle('FIFA World Cup 2026 - Top 8 Quarter-Finalists by Performance Score', 
-                    fontsize=16, fontweight='bold', y=0.98)
+        logger.info("✅ Visualization saved to %s and %s", output_path, pie_path)
+        return output_path
+    
+    def _render_pie_svg(self, conf_counts: Counter) -> str:
+        """
+        Render the confederation distribution of the top 8 as an SVG pie chart.
         
-        plt.tight_layout()
+        Args:
+            conf_counts: Counter mapping confederation -> number of teams
+            
+        Returns:
+            SVG document as a string
+        """
+        colors_pie = ['#3498db', '#e74c3c', '#f39c12', '#9b59b6', '#1abc9c', '#34495e']
+        confederations = list(conf_counts.keys())
+        counts = np.array(list(conf_counts.values()), dtype=np.float64)
+        
+        cx, cy, r = 200, 210, 150
+        width, height = 520, 400 + 22 * len(confederations)
+        
+        # Wedges start at 12 o'clock and run counter-clockwise (matplotlib startangle=90)
+        fractions = counts / counts.sum()
+        ends = np.pi / 2 + np.cumsum(fractions) * 2 * np.pi
+        starts = ends - fractions * 2 * np.pi
+        mids = (starts + ends) / 2
+        
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}" font-family="DejaVu Sans, Arial, sans-serif">',
+            f'<text x="{width / 2:.0f}" y="30" text-anchor="middle" font-size="16" font-weight="bold">'
+            f'Confederation Distribution (Top 8 Quarter-Finalists)</text>'
+        ]
         
-        # Save visualization
-        if output_path is None:
-            output_path = 'static/hybrid_selection_visualization.png'
+        for i, conf in enumerate(confederations):
+            color = colors_pie[i % len(colors_pie)]
+            if fractions[i] >= 1.0:
+                parts.append(f'<circle cx="{cx}" cy="{cy}" r="{r}" fill="{color}" stroke="white"/>')
+            else:
+                # SVG y grows downwards, so the sine term is subtracted
+                x1, y1 = cx + r * np.cos(starts[i]), cy - r * np.sin(starts[i])
+                x2, y2 = cx + r * np.cos(ends[i]), cy - r * np.sin(ends[i])
+                large_arc = 1 if fractions[i] > 0.5 else 0
+                parts.append(
+                    f'<path d="M {cx} {cy} L {x1:.2f} {y1:.2f} A {r} {r} 0 {large_arc} 0 {x2:.2f} {y2:.2f} Z" '
+                    f'fill="{color}" stroke="white"/>'
+                )
+            
+            # Count inside the wedge, confederation name just outside
+            tx, ty = cx + 0.6 * r * np.cos(mids[i]), cy - 0.6 * r * np.sin(mids[i])
+            lx, ly = cx + 1.15 * r * np.cos(mids[i]), cy - 1.15 * r * np.sin(mids[i])
+            anchor = 'start' if np.cos(mids[i]) > 0.1 else 'end' if np.cos(mids[i]) < -0.1 else 'middle'
+            parts.append(
+                f'<text x="{tx:.2f}" y="{ty:.2f}" text-anchor="middle" dominant-baseline="middle" '
+                f'font-size="14" font-weight="bold" fill="white">{int(counts[i])}</text>'
+            )
+            parts.append(
+                f'<text x="{lx:.2f}" y="{ly:.2f}" text-anchor="{anchor}" dominant-baseline="middle" '
+                f'font-size="13" font-weight="bold">{html.escape(conf)}</text>'
+            )
         
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        # Legend with team names per confederation
+        for i, conf in enumerate(confederations):
+            y = 400 + 22 * i
+            teams_in_conf = [t['name'] for t in self.final_8_teams if t['confederation'] == conf]
+            parts.append(f'<rect x="20" y="{y - 11}" width="14" height="14" fill="{colors_pie[i % len(colors_pie)]}"/>')
+            parts.append(
+                f'<text x="42" y="{y}" font-size="12">'
+                f'{html.escape(conf)}: {html.escape(", ".join(teams_in_conf))}</text>'
+            )
         
-        print(f"\n✅ Visualization saved to {output_path}")
-        return output_path
+        parts.append('</svg>')
+        return '\n'.join(parts)
     
     def save_results(self, output_dir: str = 'data/processed'):
         """
         Save selection results to JSON files.
         
+        Args:
+            output_dir: Directory to save results
+        """
+        self.save_finalists(output_dir)
+        self.save_analysis(output_dir)
+    
+    def save_finalists(self, output_dir: str = 'data/processed'):
+        """
+        Save the final 8 teams to finalist_teams.json.
+        
         Args:
             output_dir: Directory to save results
         """
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        # Save final 8 teams
+        # Machine-read only, so skip pretty-printing
         finalist_path = output_path / 'finalist_teams.json'
-        with open(finalist_path, 'w', encoding='utf-8') as f:
-            json.dump(self.final_8_teams, f, indent=2, ensure_ascii=False)
+        _write_json(finalist_path, self.final_8_teams, pretty=False)
         
-        print(f"✅ Saved 8 finalist teams to {finalist_path}")
+        logger.info("✅ Saved 8 finalist teams to %s", finalist_path)
+    
+    def save_analysis(self, output_dir: str = 'data/processed'):
+        """
+        Save the selection analysis to hybrid_selection_analysis.json.
+        
+        Args:
+            output_dir: Directory to save results
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        # Build distribution and per-team summary in a single pass over the finalists
+        conf_count = Counter()
+        top_8 = []
+        for i, team in enumerate(self.final_8_teams):
+            conf = team['confederation']
+            conf_count[conf] += 1
+            top_8.append({
+                'rank': i + 1,
+                'name': team['name'],
+                'confederation': conf,
+                'performance_score': team['score'],
+                'fifa_rank': team.get('fifa_rank', team.get('rank', 0)),
+                'selection_method': 'Top 8 Performance'
+            })
         
         # Save selection analysis
         analysis = {
             'selection_method': 'Top 8 by Performance Score',
             'total_teams_analyzed': len(self.all_teams),
             'finalists_selected': len(self.final_8_teams),
-            'confederation_distribution': {
-                conf: sum(1 for t in self.final_8_teams if t.get('confederation') == conf)
-                for conf in set(t.get('confederation', 'Unknown') for t in self.final_8_teams)
-            },
-            'top_8_teams': [
-                {
-                    'rank': i + 1,
-                    'name': team['name'],
-                    'confederation': team.get('confederation', 'Unknown'),
-                    'performance_score': team.get('score', team.get('performance_score', 0)),
-                    'fifa_rank': team.get('fifa_rank', team.get('rank', 0)),
-                    'selection_method': 'Top 8 Performance'
-                }
-                for i, team in enumerate(self.final_8_teams)
-            ]
+            'confederation_distribution': dict(conf_count),
+            'top_8_teams': top_8
         }
         
         analysis_path = output_path / 'hybrid_selection_analysis.json'
-        with open(analysis_path, 'w', encoding='utf-8') as f:
-            json.dump(analysis, f, indent=2, ensure_ascii=False)
+        _write_json(analysis_path, analysis)
         
-        print(f"✅ Saved hybrid selection analysis to {analysis_path}")
+        logger.info("✅ Saved hybrid selection analysis to %s", analysis_path)
 
 
 def run_hybrid_selection(teams_data: List[Dict], visualize: bool = True) -> Tuple[List[Dict], Dict]:
@@ -357,9 +371,7 @@ def run_hybrid_selection(teams_data: List[Dict], visualize: bool = True) -> Tupl
     Returns:
         Tuple of (selected_teams, selection_info)
     """
-    print(f"\n{'='*70}")
-    print(f"🏆 FIFA WORLD CUP 2026 - TOP 8 QUARTER-FINALISTS")
-    print(f"{'='*70}")
+    logger.info("🏆 FIFA WORLD CUP 2026 - TOP 8 QUARTER-FINALISTS")
     
     # Initialize selector
     selector = HybridTeamSelector(teams_data)
@@ -367,17 +379,21 @@ def run_hybrid_selection(teams_data: List[Dict], visualize: bool = True) -> Tupl
     # Perform hybrid selection
     final_8_teams = selector.select_quarter_finalists()
     
-    # Create visualization
-    if visualize:
-        print(f"\n🎨 Creating visualization...")
-        # Save to the TASK_6_Deployment/static folder (Flask static folder)
-        script_dir = Path(__file__).resolve().parent
-        static_path = script_dir.parent.parent / 'TASK_6_Deployment' / 'static' / 'hybrid_selection_visualization.png'
-        selector.visualize_selection(str(static_path))
-    
-    # Save results
-    print(f"\n💾 Saving results...")
-    selector.save_results()
+    # Render the visualization and write both JSON files concurrently (all IO-bound)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = []
+        if visualize:
+            logger.info("🎨 Creating visualization...")
+            static_path = _STATIC_DIR / 'hybrid_selection_visualization.png'
+            futures.append(executor.submit(selector.visualize_selection, str(static_path)))
+        
+        logger.info("💾 Saving results...")
+        futures.append(executor.submit(selector.save_finalists))
+        futures.append(executor.submit(selector.save_analysis))
+        
+        # Re-raise any error from the worker threads
+        for future in futures:
+            future.result()
     
     # Prepare return info
     selection_info = {
@@ -387,9 +403,7 @@ def run_hybrid_selection(teams_data: List[Dict], visualize: bool = True) -> Tupl
         'all_teams': final_8_teams
     }
     
-    print(f"\n{'='*70}")
-    print(f"✅ TOP 8 SELECTION COMPLETE!")
-    print(f"{'='*70}\n")
+    logger.info("✅ TOP 8 SELECTION COMPLETE!")
     
     return final_8_teams, selection_info
 
@@ -1,22 +1,75 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
+import atexit
+import hashlib
 import heapq
+import itertools
+import numpy as np
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 import json
+import math
 import os
+import re
 import sys
+import tempfile
+import threading
+import time
 from datetime import datetime
+from functools import lru_cache
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    import fcntl  # POSIX only
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Custom paths storage
-SAVED_PATHS = {}
+# Custom paths storage, least recently used first
+SAVED_PATHS = OrderedDict()
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# gzip/brotli for JSON responses; tiny payloads (health checks, errors) are left alone
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (sorted keys like the default; inf/nan become null)"""
+    
+    OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if ORJSON_AVAILABLE else 0
+    
+    def dumps(self, obj, **kwargs):
+        option = self.OPTIONS | (orjson.OPT_INDENT_2 if kwargs.get('indent') else 0)
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
 # Campus data structure - Chanakya University, Karnataka, India
 CAMPUS_BUILDINGS = {
     "Main Gate": {"lat": 13.2215, "lng": 77.7545, "type": "entrance"},
@@ -111,188 +164,447 @@ CAMPUS_CONNECTIONS = [
     ("Central Plaza", "Science Block", 0.09)
 ]
 
+# Buildings get integer ids in name order (so heap ties still break alphabetically);
+# the searches work on ids and names are only used at the API boundary and in traces
+BUILDING_NAMES = sorted(CAMPUS_BUILDINGS)
+BUILDING_IDS = {name: i for i, name in enumerate(BUILDING_NAMES)}
+# Coordinates projected to km once (equirectangular: 1 degree lat ≈ 111 km, 1 degree lng
+# shrinks by cos(latitude), ≈ 108 km on campus)
+LAT_KM = 111.0
+LNG_KM = LAT_KM * math.cos(math.radians(np.mean([b['lat'] for b in CAMPUS_BUILDINGS.values()])))
+BUILDING_Y = np.array([CAMPUS_BUILDINGS[name]['lat'] for name in BUILDING_NAMES]) * LAT_KM
+BUILDING_X = np.array([CAMPUS_BUILDINGS[name]['lng'] for name in BUILDING_NAMES]) * LNG_KM
+
 def build_graph():
-    """Build adjacency graph from connections"""
-    graph = {}
+    """Build adjacency graph from connections, indexed by building id"""
+    # Connections are constant data: check the names once instead of guarding every edge
+    unknown = {name for source, dest, _ in CAMPUS_CONNECTIONS for name in (source, dest)} - CAMPUS_BUILDINGS.keys()
+    if unknown:
+        raise ValueError(f"CAMPUS_CONNECTIONS references unknown buildings: {sorted(unknown)}")
     
-    # Initialize all buildings
-    for building in CAMPUS_BUILDINGS:
-        graph[building] = []
+    sources = np.array([BUILDING_IDS[source] for source, _, _ in CAMPUS_CONNECTIONS], dtype=np.intp)
+    dests = np.array([BUILDING_IDS[dest] for _, dest, _ in CAMPUS_CONNECTIONS], dtype=np.intp)
+    distances = np.array([distance for _, _, distance in CAMPUS_CONNECTIONS], dtype=np.float64)
     
-    # Add connections (bidirectional)
-    for source, dest, distance in CAMPUS_CONNECTIONS:
-        if source in graph and dest in graph:
-            graph[source].append((dest, distance))
-            graph[dest].append((source, distance))
+    # Add connections (bidirectional): interleave both directions of each edge, then a stable
+    # sort by source groups them into rows while keeping each row in connection order
+    edge_from = np.column_stack((sources, dests)).ravel()
+    edge_to = np.column_stack((dests, sources)).ravel()
+    edge_distance = np.repeat(distances, 2)
+    order = np.argsort(edge_from, kind='stable')
+    row_bounds = np.searchsorted(edge_from[order], np.arange(len(BUILDING_NAMES) + 1)).tolist()
+    neighbors = edge_to[order].tolist()
+    weights = edge_distance[order].tolist()
     
-    return graph
+    # Freeze each row; the graph is read-only once built
+    return [
+        tuple(zip(neighbors[lo:hi], weights[lo:hi]))
+        for lo, hi in zip(row_bounds, row_bounds[1:])
+    ]
 
 def calculate_distance(building1, building2):
-    """Calculate Euclidean distance between two buildings"""
-    if building1 not in CAMPUS_BUILDINGS or building2 not in CAMPUS_BUILDINGS:
-        return float('inf')
-    
-    b1 = CAMPUS_BUILDINGS[building1]
-    b2 = CAMPUS_BUILDINGS[building2]
-    
+    """Calculate Euclidean distance between buildings by id (either may be an id array)"""
     # Simple distance calculation (in km, roughly)
-    lat_diff = (b1['lat'] - b2['lat']) * 111.0  # 1 degree lat ≈ 111 km
-    lng_diff = (b1['lng'] - b2['lng']) * 85.0   # 1 degree lng ≈ 85 km at this latitude
-    
-    return (lat_diff**2 + lng_diff**2)**0.5
+    return np.hypot(BUILDING_X[building1] - BUILDING_X[building2], BUILDING_Y[building1] - BUILDING_Y[building2])
 
-def bfs_pathfinding(graph, start, goal):
+def reconstruct_path(parent, goal):
+    """Walk parent pointers back from goal to rebuild the path"""
+    path = []
+    node = goal
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+def bfs_pathfinding(graph, start, goal, trace=False):
     """Breadth-First Search pathfinding"""
     if start == goal:
-        return [start], 0, ['Start and destination are the same']
+        return [start], 0, ['Start and destination are the same'] if trace else 1
     
-    queue = [(start, [start], 0)]
-    visited = {start}
-    steps = [f"Starting BFS from {start}"]
+    queue = deque([(start, 0)])
+    parent = {start: None}  # Doubles as the visited set
+    steps = [f"Starting BFS from {BUILDING_NAMES[start]}"] if trace else None
+    step_count = 1
     
     while queue:
-        current, path, cost = queue.pop(0)
-        steps.append(f"Exploring {current}")
-        
-        for neighbor, distance in graph.get(current, []):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                new_path = path + [neighbor]
+        current, cost = queue.popleft()
+        step_count += 1
+        if trace:
+            steps.append(f"Exploring {BUILDING_NAMES[current]}")
+        
+        for neighbor, distance in graph[current]:
+            if neighbor not in parent:
+                parent[neighbor] = current
                 new_cost = cost + distance
                 
                 if neighbor == goal:
-                    steps.append(f"Found destination {goal}")
-                    return new_path, new_cost, steps
+                    step_count += 1
+                    if trace:
+                        steps.append(f"Found destination {BUILDING_NAMES[goal]}")
+                    return reconstruct_path(parent, goal), new_cost, steps if trace else step_count
                 
-                queue.append((neighbor, new_path, new_cost))
-                steps.append(f"Added {neighbor} to queue")
+                queue.append((neighbor, new_cost))
+                step_count += 1
+                if trace:
+                    steps.append(f"Added {BUILDING_NAMES[neighbor]} to queue")
     
-    steps.append("No path found")
-    return None, float('inf'), steps
+    step_count += 1
+    if trace:
+        steps.append("No path found")
+    return None, float('inf'), steps if trace else step_count
 
-def dfs_pathfinding(graph, start, goal):
+def dfs_pathfinding(graph, start, goal, trace=False):
     """Depth-First Search pathfinding"""
     if start == goal:
-        return [start], 0, ['Start and destination are the same']
+        return [start], 0, ['Start and destination are the same'] if trace else 1
     
-    stack = [(start, [start], 0)]
-    visited = set()
-    steps = [f"Starting DFS from {start}"]
+    # Entries carry the node they were pushed from; parent is fixed on first visit
+    stack = [(start, None, 0)]
+    parent = {}
+    steps = [f"Starting DFS from {BUILDING_NAMES[start]}"] if trace else None
+    step_count = 1
     
     while stack:
-        current, path, cost = stack.pop()
+        current, came_from, cost = stack.pop()
         
-        if current in visited:
+        if current in parent:
             continue
             
-        visited.add(current)
-        steps.append(f"Visiting {current}")
+        parent[current] = came_from
+        step_count += 1
+        if trace:
+            steps.append(f"Visiting {BUILDING_NAMES[current]}")
         
         if current == goal:
-            steps.append(f"Found destination {goal}")
-            return path, cost, steps
-        
-        for neighbor, distance in graph.get(current, []):
-            if neighbor not in visited:
-                stack.append((neighbor, path + [neighbor], cost + distance))
-                steps.append(f"Added {neighbor} to stack")
+            step_count += 1
+            if trace:
+                steps.append(f"Found destination {BUILDING_NAMES[goal]}")
+            return reconstruct_path(parent, goal), cost, steps if trace else step_count
+        
+        for neighbor, distance in graph[current]:
+            if neighbor not in parent:
+                stack.append((neighbor, current, cost + distance))
+                step_count += 1
+                if trace:
+                    steps.append(f"Added {BUILDING_NAMES[neighbor]} to stack")
     
-    steps.append("No path found")
-    return None, float('inf'), steps
+    step_count += 1
+    if trace:
+        steps.append("No path found")
+    return None, float('inf'), steps if trace else step_count
 
-def ucs_pathfinding(graph, start, goal):
+def ucs_pathfinding(graph, start, goal, trace=False):
     """Uniform Cost Search pathfinding"""
     if start == goal:
-        return [start], 0, ['Start and destination are the same']
+        return [start], 0, ['Start and destination are the same'] if trace else 1
     
-    priority_queue = [(0, start, [start])]
-    visited = set()
-    steps = [f"Starting UCS from {start}"]
+    # Entries carry the node they were pushed from (-1 for start)
+    priority_queue = [(0, start, -1)]
+    parent = {}
+    best_cost = {start: 0}
+    steps = [f"Starting UCS from {BUILDING_NAMES[start]}"] if trace else None
+    step_count = 1
     
     while priority_queue:
-        cost, current, path = heapq.heappop(priority_queue)
+        cost, current, came_from = heapq.heappop(priority_queue)
         
-        if current in visited:
+        if current in parent:
             continue
             
-        visited.add(current)
-        steps.append(f"Visiting {current} with cost {cost:.2f}")
+        parent[current] = came_from if came_from >= 0 else None
+        step_count += 1
+        if trace:
+            steps.append(f"Visiting {BUILDING_NAMES[current]} with cost {cost:.2f}")
         
         if current == goal:
-            steps.append(f"Found optimal path to {goal} with cost {cost:.2f}")
-            return path, cost, steps
-        
-        for neighbor, distance in graph.get(current, []):
-            if neighbor not in visited:
-                new_cost = cost + distance
-                new_path = path + [neighbor]
-                heapq.heappush(priority_queue, (new_cost, neighbor, new_path))
-                steps.append(f"Added {neighbor} to queue with cost {new_cost:.2f}")
+            step_count += 1
+            if trace:
+                steps.append(f"Found optimal path to {BUILDING_NAMES[goal]} with cost {cost:.2f}")
+            return reconstruct_path(parent, goal), cost, steps if trace else step_count
+        
+        for neighbor, distance in graph[current]:
+            new_cost = cost + distance
+            # Skip entries that are strictly worse than one already queued; they would only be
+            # popped and discarded. Equal-cost entries stay so ties resolve as before.
+            if neighbor not in parent and new_cost <= best_cost.get(neighbor, float('inf')):
+                best_cost[neighbor] = new_cost
+                heapq.heappush(priority_queue, (new_cost, neighbor, current))
+                step_count += 1
+                if trace:
+                    steps.append(f"Added {BUILDING_NAMES[neighbor]} to queue with cost {new_cost:.2f}")
     
-    steps.append("No path found")
-    return None, float('inf'), steps
+    step_count += 1
+    if trace:
+        steps.append("No path found")
+    return None, float('inf'), steps if trace else step_count
 
-def a_star_pathfinding(graph, start, goal):
+def a_star_pathfinding(graph, start, goal, trace=False):
     """A* Search pathfinding"""
     if start == goal:
-        return [start], 0, ['Start and destination are the same']
+        return [start], 0, ['Start and destination are the same'] if trace else 1
     
-    def heuristic(node):
-        return calculate_distance(node, goal)
+    # Goal is fixed for the whole search, so compute every heuristic in one vectorized pass
+    h_table = (calculate_distance(np.arange(len(BUILDING_NAMES)), goal) * HEURISTIC_SCALE).tolist()
     
-    priority_queue = [(heuristic(start), 0, start, [start])]
-    visited = set()
-    steps = [f"Starting A* from {start} to {goal}"]
+    # Entries carry the node they were pushed from (-1 for start)
+    priority_queue = [(h_table[start], 0, start, -1)]
+    parent = {}
+    best_g = {start: 0}
+    steps = [f"Starting A* from {BUILDING_NAMES[start]} to {BUILDING_NAMES[goal]}"] if trace else None
+    step_count = 1
     
     while priority_queue:
-        f_cost, g_cost, current, path = heapq.heappop(priority_queue)
+        f_cost, g_cost, current, came_from = heapq.heappop(priority_queue)
         
-        if current in visited:
+        if current in parent:
             continue
             
-        visited.add(current)
-        h_cost = f_cost - g_cost
-        steps.append(f"Visiting {current}: g={g_cost:.2f}, h={h_cost:.2f}, f={f_cost:.2f}")
+        parent[current] = came_from if came_from >= 0 else None
+        step_count += 1
+        if trace:
+            h_cost = f_cost - g_cost
+            steps.append(f"Visiting {BUILDING_NAMES[current]}: g={g_cost:.2f}, h={h_cost:.2f}, f={f_cost:.2f}")
         
         if current == goal:
-            steps.append(f"Found optimal path to {goal} with cost {g_cost:.2f}")
-            return path, g_cost, steps
-        
-        for neighbor, distance in graph.get(current, []):
-            if neighbor not in visited:
-                new_g_cost = g_cost + distance
-                new_h_cost = heuristic(neighbor)
+            step_count += 1
+            if trace:
+                steps.append(f"Found optimal path to {BUILDING_NAMES[goal]} with cost {g_cost:.2f}")
+            return reconstruct_path(parent, goal), g_cost, steps if trace else step_count
+        
+        for neighbor, distance in graph[current]:
+            new_g_cost = g_cost + distance
+            # Skip entries that are strictly worse than one already queued; they would only be
+            # popped and discarded. Equal-cost entries stay so ties resolve as before.
+            if neighbor not in parent and new_g_cost <= best_g.get(neighbor, float('inf')):
+                best_g[neighbor] = new_g_cost
+                new_h_cost = h_table[neighbor]
                 new_f_cost = new_g_cost + new_h_cost
-                new_path = path + [neighbor]
-                heapq.heappush(priority_queue, (new_f_cost, new_g_cost, neighbor, new_path))
-                steps.append(f"Added {neighbor}: g={new_g_cost:.2f}, h={new_h_cost:.2f}, f={new_f_cost:.2f}")
+                heapq.heappush(priority_queue, (new_f_cost, new_g_cost, neighbor, current))
+                step_count += 1
+                if trace:
+                    steps.append(f"Added {BUILDING_NAMES[neighbor]}: g={new_g_cost:.2f}, h={new_h_cost:.2f}, f={new_f_cost:.2f}")
+    
+    step_count += 1
+    if trace:
+        steps.append("No path found")
+    return None, float('inf'), steps if trace else step_count
+
+def bidirectional_a_star_pathfinding(graph, start, goal, trace=False):
+    """Bidirectional A* pathfinding: searches from both ends and meets in the middle"""
+    if start == goal:
+        return [start], 0, ['Start and destination are the same'] if trace else 1
+    
+    # The graph is undirected, so the backward search walks the same rows towards start
+    node_ids = np.arange(len(BUILDING_NAMES))
+    h_tables = (
+        (calculate_distance(node_ids, goal) * HEURISTIC_SCALE).tolist(),
+        (calculate_distance(node_ids, start) * HEURISTIC_SCALE).tolist()
+    )
+    queues = ([(h_tables[0][start], 0, start)], [(h_tables[1][goal], 0, goal)])
+    best_g = ({start: 0}, {goal: 0})
+    parents = ({start: None}, {goal: None})
+    settled = (set(), set())
+    labels = ('forward', 'backward')
+    steps = [f"Starting bidirectional A* from {BUILDING_NAMES[start]} and {BUILDING_NAMES[goal]}"] if trace else None
+    step_count = 1
+    
+    # Best complete route seen so far and the node where its two halves meet
+    best_cost = float('inf')
+    meeting = None
+    side = 0
+    
+    while queues[0] and queues[1]:
+        # With consistent heuristics no route through either frontier can beat best_cost
+        # once its smallest f-cost reaches it
+        if max(queues[0][0][0], queues[1][0][0]) >= best_cost:
+            break
+        
+        queue, g_table, parent = queues[side], best_g[side], parents[side]
+        other_g = best_g[1 - side]
+        f_cost, g_cost, current = heapq.heappop(queue)
+        
+        if current in settled[side] or g_cost > g_table[current]:
+            side = 1 - side
+            continue
+        
+        settled[side].add(current)
+        step_count += 1
+        if trace:
+            steps.append(f"Visiting {BUILDING_NAMES[current]} ({labels[side]}): g={g_cost:.2f}, f={f_cost:.2f}")
+        
+        for neighbor, distance in graph[current]:
+            new_g_cost = g_cost + distance
+            if neighbor in settled[side] or new_g_cost >= g_table.get(neighbor, float('inf')):
+                continue
+            
+            g_table[neighbor] = new_g_cost
+            parent[neighbor] = current
+            heapq.heappush(queue, (new_g_cost + h_tables[side][neighbor], new_g_cost, neighbor))
+            step_count += 1
+            if trace:
+                steps.append(f"Added {BUILDING_NAMES[neighbor]} ({labels[side]}): g={new_g_cost:.2f}")
+            
+            if neighbor in other_g and new_g_cost + other_g[neighbor] < best_cost:
+                best_cost = new_g_cost + other_g[neighbor]
+                meeting = neighbor
+        
+        side = 1 - side
+    
+    step_count += 1
+    if meeting is None:
+        if trace:
+            steps.append("No path found")
+        return None, float('inf'), steps if trace else step_count
+    
+    # Forward half runs start -> meeting, backward half runs meeting -> goal
+    path = reconstruct_path(parents[0], meeting)
+    node = parents[1][meeting]
+    while node is not None:
+        path.append(node)
+        node = parents[1][node]
     
-    steps.append("No path found")
-    return None, float('inf'), steps
+    if trace:
+        steps.append(f"Searches met at {BUILDING_NAMES[meeting]}; optimal path cost {best_cost:.2f}")
+    return path, best_cost, steps if trace else step_count
 
 # Build the campus graph
 campus_graph = build_graph()
 
-# Algorithm mapping
+# Edge weights are hand-authored walking distances, often shorter than the straight line
+# between the pinned coordinates. Scale the heuristic so it never exceeds any edge weight;
+# that keeps it consistent, so A* still returns the shortest route.
+HEURISTIC_SCALE = min([1.0] + [
+    distance / straight
+    for source, dest, distance in CAMPUS_CONNECTIONS
+    if (straight := calculate_distance(BUILDING_IDS[source], BUILDING_IDS[dest])) > 0
+])
+
+# Algorithm mapping. Each takes building ids and returns (path_ids, cost, steps); steps is
+# the list of trace messages when called with trace=True, otherwise just the step count.
 ALGORITHMS = {
     'BFS': bfs_pathfinding,
     'DFS': dfs_pathfinding,
     'UCS': ucs_pathfinding,
-    'A*': a_star_pathfinding
+    'A*': a_star_pathfinding,
+    'BiA*': bidirectional_a_star_pathfinding
 }
 
-@app.route('/')
-def serve_index():
-    """Serve the main HTML file"""
-    return send_from_directory('../frontend', 'index.html')
+def find_route(algorithm, start, end, trace=False):
+    """Run a search between two building names and return (path_names, cost, steps)"""
+    path, cost, steps = ALGORITHMS[algorithm](campus_graph, BUILDING_IDS[start], BUILDING_IDS[end], trace=trace)
+    if path is not None:
+        path = [BUILDING_NAMES[node] for node in path]
+    return path, cost, steps
+
+# Memoized untraced A* routes keyed by (start, end). Callers validate names first, so this holds
+# at most one entry per building pair and never needs evicting.
+_route_cache = {}
+# Pairs currently being computed; concurrent callers wait on the Event instead of recomputing
+_route_inflight = {}
+_route_lock = threading.Lock()
 
-@app.route('/<path:filename>')
-def serve_static(filename):
-    """Serve static files from frontend directory"""
+def _astar_cached(start, end):
+    """Untraced A* route between two building names, memoized as (path_tuple, cost)"""
+    key = (start, end)
+    route = _route_cache.get(key)
+    if route is not None:
+        return route
+    
+    with _route_lock:
+        route = _route_cache.get(key)
+        if route is not None:
+            return route
+        pending = _route_inflight.get(key)
+        owner = pending is None
+        if owner:
+            pending = _route_inflight[key] = threading.Event()
+    
+    if not owner:
+        pending.wait()
+        route = _route_cache.get(key)
+        if route is not None:
+            return route
+        # The first caller failed; fall through and compute it here without registering
+    
     try:
-        return send_from_directory('../frontend', filename)
-    except:
-        return "File not found", 404
+        path, cost, _ = find_route('A*', start, end)
+        route = _route_cache[key] = (tuple(path) if path is not None else None), cost
+        return route
+    finally:
+        if owner:
+            with _route_lock:
+                del _route_inflight[key]
+            pending.set()
+
+@lru_cache(maxsize=16)
+def shortest_path_tree(start):
+    """Single-source Dijkstra from a building id: (dist, parent) per id, inf / None if unreachable"""
+    dist = [math.inf] * len(BUILDING_NAMES)
+    parent = [None] * len(BUILDING_NAMES)
+    settled = [False] * len(BUILDING_NAMES)
+    dist[start] = 0
+    priority_queue = [(0, start)]
+    
+    while priority_queue:
+        cost, current = heapq.heappop(priority_queue)
+        if settled[current]:
+            continue
+        settled[current] = True
+        
+        for neighbor, distance in campus_graph[current]:
+            new_cost = cost + distance
+            if new_cost < dist[neighbor]:
+                dist[neighbor] = new_cost
+                parent[neighbor] = current
+                heapq.heappush(priority_queue, (new_cost, neighbor))
+    
+    # Tuples, since cached results are shared between requests
+    return tuple(dist), tuple(parent)
+
+# Responses only need second resolution, so format the timestamp once per second
+_timestamp_cache = (0, '')
+
+def now_iso():
+    """Current local time as an ISO string, cached per second"""
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, stamp = _timestamp_cache
+    if cached_second != second:
+        stamp = datetime.fromtimestamp(second).isoformat()
+        _timestamp_cache = (second, stamp)
+    return stamp
+
+def json_body(payload):
+    """Serialize a payload once and return (body_bytes, etag) for conditional responses"""
+    # Encode up front too, so serving the body never re-encodes it
+    body = app.json.dumps(payload).encode('utf-8')
+    return body, hashlib.md5(body).hexdigest()
+
+def cached_json_response(body, etag):
+    """Serve a pre-serialized JSON body with caching headers (304 if the client is current)"""
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response.make_conditional(request)
+
+# In production nginx serves ../frontend directly (see nginx.conf); set SERVE_FRONTEND=false
+# there so only the API goes through Flask
+SERVE_FRONTEND = os.environ.get('SERVE_FRONTEND', 'True').lower() == 'true'
+
+if SERVE_FRONTEND:
+    @app.route('/')
+    def serve_index():
+        """Serve the main HTML file"""
+        return send_from_directory('../frontend', 'index.html')
+    
+    @app.route('/<path:filename>')
+    def serve_static(filename):
+        """Serve static files from frontend directory"""
+        try:
+            return send_from_directory('../frontend', filename)
+        except:
+            return "File not found", 404
 
 @app.route('/api/health')
 def health_check():
@@ -300,26 +612,75 @@ def health_check():
     return jsonify({
         'status': 'online',
         'message': 'Chanakya University PathFinder API is running',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now_iso(),
         'version': '1.0.0'
     })
 
+BUILDING_FIELDS = ('name', 'lat', 'lng', 'type')
+
+def buildings_payload(fields=BUILDING_FIELDS):
+    """Building list restricted to the given fields"""
+    return {
+        'buildings': [
+            {
+                field: value
+                for field, value in (('name', name), ('lat', data['lat']), ('lng', data['lng']), ('type', data['type']))
+                if field in fields
+            }
+            for name, data in CAMPUS_BUILDINGS.items()
+        ],
+        'count': len(CAMPUS_BUILDINGS)
+    }
+
+# Building list only changes on deploy, so serialize it once
+BUILDINGS_BODY, BUILDINGS_ETAG = json_body(buildings_payload())
+
+# Sparse fieldsets (?fields=name,lat) keyed by the canonical field tuple; at most 15 subsets,
+# each serialized on first request
+BUILDINGS_BY_FIELDS = {BUILDING_FIELDS: (BUILDINGS_BODY, BUILDINGS_ETAG)}
+
 @app.route('/api/buildings')
 def get_buildings():
-    """Get all available buildings"""
-    buildings = []
-    for name, data in CAMPUS_BUILDINGS.items():
-        buildings.append({
-            'name': name,
-            'lat': data['lat'],
-            'lng': data['lng'],
-            'type': data['type']
-        })
+    """Get all available buildings, optionally only some fields (?fields=name,lat,lng)"""
+    fields = request.args.get('fields')
+    if not fields:
+        return cached_json_response(BUILDINGS_BODY, BUILDINGS_ETAG)
     
-    return jsonify({
-        'buildings': buildings,
-        'count': len(buildings)
-    })
+    requested = {field.strip() for field in fields.split(',')}
+    selected = tuple(field for field in BUILDING_FIELDS if field in requested)
+    if not selected:
+        return jsonify({'error': f'fields must include at least one of: {", ".join(BUILDING_FIELDS)}'}), 400
+    
+    if selected not in BUILDINGS_BY_FIELDS:
+        BUILDINGS_BY_FIELDS[selected] = json_body(buildings_payload(selected))
+    return cached_json_response(*BUILDINGS_BY_FIELDS[selected])
+
+def route_summary(start, end, path, cost, algorithm='A*'):
+    """Build the route fields shared by /api/pathfind and /api/pathfind-batch"""
+    # Calculate additional metrics
+    walking_speed_kmh = 5.0  # Average walking speed
+    walking_time_hours = cost / walking_speed_kmh
+    walking_time_minutes = walking_time_hours * 60
+    
+    # Get coordinates for path
+    coordinates = []
+    for building in path:
+        if building in CAMPUS_BUILDINGS:
+            building_data = CAMPUS_BUILDINGS[building]
+            coordinates.append([building_data['lat'], building_data['lng']])
+    
+    return {
+        'success': True,
+        'path': path,
+        'cost': round(cost, 3),
+        'distance_km': round(cost, 3),
+        'walking_time_minutes': round(walking_time_minutes, 1),
+        'num_stops': len(path) - 2,  # Excluding start and end
+        'algorithm': algorithm,
+        'coordinates': coordinates,
+        'start': start,
+        'end': end
+    }
 
 @app.route('/api/pathfind', methods=['POST'])
 def find_path():
@@ -333,6 +694,7 @@ def find_path():
         start = data.get('start')
         end = data.get('end')
         algorithm = 'A*'  # Fixed to A* algorithm only
+        trace = bool(data.get('trace')) or request.args.get('trace') == '1'
         
         # Validate inputs
         if not start or not end:
@@ -347,44 +709,28 @@ def find_path():
         # Find path using A* algorithm only
         logger.info(f"Finding path from {start} to {end} using A* algorithm")
         
-        path_func = ALGORITHMS['A*']
-        path, cost, steps = path_func(campus_graph, start, end)
+        if trace:
+            path, cost, steps = find_route('A*', start, end, trace=True)
+        else:
+            path, cost = _astar_cached(start, end)
         
         if path is None:
-            return jsonify({
+            response = {
                 'success': False,
-                'error': 'No path found',
-                'steps': steps
-            }), 404
-        
-        # Calculate additional metrics
-        walking_speed_kmh = 5.0  # Average walking speed
-        walking_time_hours = cost / walking_speed_kmh
-        walking_time_minutes = walking_time_hours * 60
-        
-        # Get coordinates for path
-        coordinates = []
-        for building in path:
-            if building in CAMPUS_BUILDINGS:
-                building_data = CAMPUS_BUILDINGS[building]
-                coordinates.append([building_data['lat'], building_data['lng']])
+                'error': 'No path found'
+            }
+            if trace:
+                response['steps'] = steps
+            return jsonify(response), 404
         
-        response = {
-            'success': True,
-            'path': path,
-            'cost': round(cost, 3),
-            'distance_km': round(cost, 3),
-            'walking_time_minutes': round(walking_time_minutes, 1),
-            'num_stops': len(path) - 2,  # Excluding start and end
-            'algorithm': algorithm,
-            'coordinates': coordinates,
-            'steps': steps,
-            'start': start,
-            'end': end,
-            'timestamp': datetime.now().isoformat()
-        }
+        response = route_summary(start, end, path, cost, algorithm)
+        response['timestamp'] = now_iso()
+        
+        # Search trace is only built on request (?trace=1 or "trace": true)
+        if trace:
+            response['steps'] = steps
         
-        logger.info(f"Path found: {' -> '.join(path)} (Cost: {cost:.3f}km, Time: {walking_time_minutes:.1f}min)")
+        logger.info(f"Path found: {' -> '.join(path)} (Cost: {cost:.3f}km, Time: {response['walking_time_minutes']:.1f}min)")
         
         return jsonify(response)
         
@@ -395,6 +741,115 @@ def find_path():
             'error': f'Internal server error: {str(e)}'
         }), 500
 
+MAX_BATCH_QUERIES = 200
+
+@app.route('/api/pathfind-batch', methods=['POST'])
+def find_paths_batch():
+    """Find A* paths for several (start, end) pairs in one request"""
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('queries'), list):
+            return jsonify({'error': 'A list of queries is required'}), 400
+        
+        queries = data['queries']
+        if len(queries) > MAX_BATCH_QUERIES:
+            return jsonify({'error': f'At most {MAX_BATCH_QUERIES} queries per batch'}), 400
+        
+        logger.info(f"Finding paths for a batch of {len(queries)} queries")
+        
+        # Identical pairs within a batch are only resolved once
+        resolved = {}
+        results = []
+        for query in queries:
+            start = query.get('start') if isinstance(query, dict) else None
+            end = query.get('end') if isinstance(query, dict) else None
+            
+            # Names must be strings before they can key the dedup cache (a list is unhashable)
+            if not isinstance(start, (str, type(None))) or not isinstance(end, (str, type(None))):
+                results.append({'success': False, 'error': 'Start and end locations must be strings'})
+                continue
+            
+            if (start, end) not in resolved:
+                if not start or not end:
+                    result = {'success': False, 'error': 'Start and end locations are required'}
+                elif start not in CAMPUS_BUILDINGS:
+                    result = {'success': False, 'error': f'Unknown start location: {start}'}
+                elif end not in CAMPUS_BUILDINGS:
+                    result = {'success': False, 'error': f'Unknown end location: {end}'}
+                else:
+                    path, cost = _astar_cached(start, end)
+                    if path is None:
+                        result = {'success': False, 'error': 'No path found'}
+                    else:
+                        result = route_summary(start, end, path, cost)
+                resolved[(start, end)] = result
+            
+            results.append(resolved[(start, end)])
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'count': len(results),
+            'timestamp': now_iso()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in batch pathfinding: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'Internal server error: {str(e)}'
+        }), 500
+
+@app.route('/api/pathfind-many', methods=['POST'])
+def find_paths_many():
+    """Find shortest paths from one start to several destinations with a single search"""
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('ends'), list):
+            return jsonify({'error': 'A start location and a list of ends are required'}), 400
+        
+        start = data.get('start')
+        ends = data['ends']
+        if not start:
+            return jsonify({'error': 'Start location is required'}), 400
+        
+        if not isinstance(start, str) or start not in CAMPUS_BUILDINGS:
+            return jsonify({'error': f'Unknown start location: {start}'}), 400
+        
+        if len(ends) > MAX_BATCH_QUERIES:
+            return jsonify({'error': f'At most {MAX_BATCH_QUERIES} destinations per request'}), 400
+        
+        logger.info(f"Finding paths from {start} to {len(ends)} destinations")
+        
+        # One Dijkstra run from start answers every destination
+        dist, parent = shortest_path_tree(BUILDING_IDS[start])
+        results = []
+        for end in ends:
+            if not isinstance(end, str) or end not in CAMPUS_BUILDINGS:
+                results.append({'success': False, 'error': f'Unknown end location: {end}'})
+            elif dist[BUILDING_IDS[end]] == math.inf:
+                results.append({'success': False, 'error': 'No path found'})
+            else:
+                path = [BUILDING_NAMES[node] for node in reconstruct_path(parent, BUILDING_IDS[end])]
+                results.append(route_summary(start, end, path, dist[BUILDING_IDS[end]], 'UCS'))
+        
+        return jsonify({
+            'success': True,
+            'start': start,
+            'results': results,
+            'count': len(results),
+            'timestamp': now_iso()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in multi-destination pathfinding: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f'Internal server error: {str(e)}'
+        }), 500
+
 @app.route('/api/compare', methods=['POST'])
 def compare_algorithms():
     """Compare multiple algorithms for the same path"""
@@ -424,8 +879,8 @@ def compare_algorithms():
             if algorithm in ALGORITHMS:
                 logger.info(f"Running {algorithm} for comparison")
                 
-                path_func = ALGORITHMS[algorithm]
-                path, cost, steps = path_func(campus_graph, start, end)
+                # Only the step count is reported, so run untraced
+                path, cost, steps_count = find_route(algorithm, start, end)
                 
                 if path is not None:
                     walking_speed_kmh = 5.0
@@ -438,7 +893,7 @@ def compare_algorithms():
                         'distance_km': round(cost, 3),
                         'walking_time_minutes': round(walking_time_minutes, 1),
                         'num_stops': len(path) - 2,
-                        'steps_count': len(steps),
+                        'steps_count': steps_count,
                         'found': True
                     }
                 else:
@@ -448,7 +903,7 @@ def compare_algorithms():
                         'distance_km': float('inf'),
                         'walking_time_minutes': float('inf'),
                         'num_stops': 0,
-                        'steps_count': len(steps),
+                        'steps_count': steps_count,
                         'found': False
                     }
         
@@ -457,7 +912,7 @@ def compare_algorithms():
             'start': start,
             'end': end,
             'results': results,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso()
         }
         
         return jsonify(response)
@@ -469,77 +924,76 @@ def compare_algorithms():
             'error': f'Internal server error: {str(e)}'
         }), 500
 
+# Satellite imagery sources shown in the map layer picker (static)
+SATELLITE_SOURCES = {
+    'Google Satellite': {
+        'provider': 'Google',
+        'description': 'High-resolution commercial satellite imagery',
+        'max_zoom': 20,
+        'coverage': 'Global',
+        'update_frequency': 'Monthly to Yearly'
+    },
+    'Google Hybrid': {
+        'provider': 'Google',
+        'description': 'Satellite imagery with street labels overlay',
+        'max_zoom': 20,
+        'coverage': 'Global',
+        'update_frequency': 'Monthly to Yearly'
+    },
+    'ISRO Bhuvan': {
+        'provider': 'Indian Space Research Organisation (ISRO)',
+        'description': 'Real satellite imagery from Indian Chandrayaan missions',
+        'max_zoom': 18,
+        'coverage': 'India and surrounding regions',
+        'update_frequency': 'Quarterly',
+        'satellite_missions': ['Chandrayaan-1', 'Chandrayaan-2', 'Mangalyaan', 'RISAT'],
+        'special_features': 'Authentic Indian space program data'
+    },
+    'ISRO Hybrid': {
+        'provider': 'Indian Space Research Organisation (ISRO)',
+        'description': 'ISRO satellite data with geographical labels',
+        'max_zoom': 18,
+        'coverage': 'India focused',
+        'update_frequency': 'Quarterly'
+    },
+    'Esri Satellite': {
+        'provider': 'Esri/Maxar',
+        'description': 'Professional GIS satellite imagery',
+        'max_zoom': 18,
+        'coverage': 'Global',
+        'update_frequency': 'Regular updates'
+    },
+    'Mapbox Satellite': {
+        'provider': 'Mapbox',
+        'description': 'Customizable satellite imagery for developers',
+        'max_zoom': 19,
+        'coverage': 'Global',
+        'update_frequency': 'Regular updates'
+    }
+}
+
+SATELLITE_INFO_BODY, SATELLITE_INFO_ETAG = json_body({
+    'satellite_sources': SATELLITE_SOURCES,
+    'total_sources': len(SATELLITE_SOURCES),
+    'recommended_for_india': 'ISRO Bhuvan',
+    'recommended_global': 'Google Satellite',
+    'info': 'CU PathFinder supports multiple satellite imagery sources including real Indian satellite data from ISRO Chandrayaan missions'
+})
+
 @app.route('/api/satellite-info')
 def get_satellite_info():
     """Get information about available satellite imagery sources"""
-    satellite_sources = {
-        'Google Satellite': {
-            'provider': 'Google',
-            'description': 'High-resolution commercial satellite imagery',
-            'max_zoom': 20,
-            'coverage': 'Global',
-            'update_frequency': 'Monthly to Yearly'
-        },
-        'Google Hybrid': {
-            'provider': 'Google',
-            'description': 'Satellite imagery with street labels overlay',
-            'max_zoom': 20,
-            'coverage': 'Global',
-            'update_frequency': 'Monthly to Yearly'
-        },
-        'ISRO Bhuvan': {
-            'provider': 'Indian Space Research Organisation (ISRO)',
-            'description': 'Real satellite imagery from Indian Chandrayaan missions',
-            'max_zoom': 18,
-            'coverage': 'India and surrounding regions',
-            'update_frequency': 'Quarterly',
-            'satellite_missions': ['Chandrayaan-1', 'Chandrayaan-2', 'Mangalyaan', 'RISAT'],
-            'special_features': 'Authentic Indian space program data'
-        },
-        'ISRO Hybrid': {
-            'provider': 'Indian Space Research Organisation (ISRO)',
-            'description': 'ISRO satellite data with geographical labels',
-            'max_zoom': 18,
-            'coverage': 'India focused',
-            'update_frequency': 'Quarterly'
-        },
-        'Esri Satellite': {
-            'provider': 'Esri/Maxar',
-            'description': 'Professional GIS satellite imagery',
-            'max_zoom': 18,
-            'coverage': 'Global',
-            'update_frequency': 'Regular updates'
-        },
-        'Mapbox Satellite': {
-            'provider': 'Mapbox',
-            'description': 'Customizable satellite imagery for developers',
-            'max_zoom': 19,
-            'coverage': 'Global',
-            'update_frequency': 'Regular updates'
-        }
-    }
-    
-    return jsonify({
-        'satellite_sources': satellite_sources,
-        'total_sources': len(satellite_sources),
-        'recommended_for_india': 'ISRO Bhuvan',
-        'recommended_global': 'Google Satellite',
-        'info': 'CU PathFinder supports multiple satellite imagery sources including real Indian satellite data from ISRO Chandrayaan missions'
-    })
+    return cached_json_response(SATELLITE_INFO_BODY, SATELLITE_INFO_ETAG)
 
-@app.route('/api/building/<building_name>')
-def get_building_info(building_name):
-    """Get information about a specific building"""
-    if building_name not in CAMPUS_BUILDINGS:
-        return jsonify({'error': f'Building not found: {building_name}'}), 404
-    
+def building_details(building_name):
+    """Build the detail payload for a building"""
     building_data = CAMPUS_BUILDINGS[building_name]
     
     # Find connected buildings
     connections = []
-    for neighbor, distance in campus_graph.get(building_name, []):
+    for neighbor, distance in campus_graph[BUILDING_IDS[building_name]]:
         connections.append({
-            'building': neighbor,
+            'building': BUILDING_NAMES[neighbor],
             'distance_km': round(distance, 3),
             'walking_time_minutes': round(distance / 5.0 * 60, 1)
         })
@@ -555,7 +1009,49 @@ def get_building_info(building_name):
         'connection_count': len(connections)
     }
     
-    return jsonify(response)
+    return response
+
+# Per-building details are derived from constant data, so serialize them once
+BUILDING_DETAILS = {name: json_body(building_details(name)) for name in CAMPUS_BUILDINGS}
+
+@app.route('/api/building/<building_name>')
+def get_building_info(building_name):
+    """Get information about a specific building"""
+    if building_name not in BUILDING_DETAILS:
+        return jsonify({'error': f'Building not found: {building_name}'}), 404
+    
+    return cached_json_response(*BUILDING_DETAILS[building_name])
+
+# Building mapping for easier chatbot recognition (order sets match priority)
+BUILDING_KEYWORDS = {
+    'library': 'Library',
+    'engineering center': 'Engineering Center',
+    'engineering': 'Engineering Center',
+    'student center': 'Student Center', 
+    'canteen': 'C4C',
+    'food court': 'Food Court',
+    'c4c': 'C4C',
+    'gym': 'Rec Center',
+    'rec center': 'Rec Center',
+    'recreation': 'Rec Center',
+    'medical center': 'Medical Center',
+    'bookstore': 'Bookstore',
+    'parking': 'Parking Garage',
+    'sports complex': 'Sports Complex',
+    'sports': 'Sports Complex',
+    'auditorium': 'Auditorium'
+}
+KEYWORD_PRIORITY = {keyword: i for i, keyword in enumerate(BUILDING_KEYWORDS)}
+
+# Single alternation, longest first so "engineering center" wins over "engineering"
+KEYWORD_RE = re.compile('|'.join(
+    re.escape(keyword) for keyword in sorted(BUILDING_KEYWORDS, key=len, reverse=True)
+))
+
+def mentioned_buildings(text):
+    """Buildings mentioned in text, ordered by BUILDING_KEYWORDS priority"""
+    keywords = sorted({m.group(0) for m in KEYWORD_RE.finditer(text)}, key=KEYWORD_PRIORITY.get)
+    return [BUILDING_KEYWORDS[keyword] for keyword in keywords]
 
 @app.route('/api/chatbot', methods=['POST'])
 def chatbot_query():
@@ -576,30 +1072,10 @@ def chatbot_query():
         # Simple pattern matching for pathfinding queries
         message_lower = user_message.lower()
         
-        # Building mapping for easier recognition
-        building_keywords = {
-            'library': 'Library',
-            'engineering center': 'Engineering Center',
-            'engineering': 'Engineering Center',
-            'student center': 'Student Center', 
-            'canteen': 'C4C',
-            'food court': 'Food Court',
-            'c4c': 'C4C',
-            'gym': 'Rec Center',
-            'rec center': 'Rec Center',
-            'recreation': 'Rec Center',
-            'medical center': 'Medical Center',
-            'bookstore': 'Bookstore',
-            'parking': 'Parking Garage',
-            'sports complex': 'Sports Complex',
-            'sports': 'Sports Complex',
-            'auditorium': 'Auditorium'
-        }
-        
         # Check for "where is" queries or "tell me about" queries
         if 'where is' in message_lower or 'tell me about' in message_lower:
-            for keyword, building_name in building_keywords.items():
-                if keyword in message_lower and building_name in CAMPUS_BUILDINGS:
+            for building_name in mentioned_buildings(message_lower):
+                if building_name in CAMPUS_BUILDINGS:
                     building_data = CAMPUS_BUILDINGS[building_name]
                     
                     response_text = f"📍 **{building_name}**\n\n"
@@ -608,8 +1084,8 @@ def chatbot_query():
                     
                     # Find connections
                     connections = []
-                    for neighbor, distance in campus_graph.get(building_name, []):
-                        connections.append(f"• {neighbor} ({round(distance * 1000)}m away)")
+                    for neighbor, distance in campus_graph[BUILDING_IDS[building_name]]:
+                        connections.append(f"• {BUILDING_NAMES[neighbor]} ({round(distance * 1000)}m away)")
                     
                     if connections:
                         response_text += f"**Connected to:**\n"
@@ -632,28 +1108,25 @@ def chatbot_query():
             
             # Handle "from X to Y" pattern
             if 'from' in message_lower and 'to' in message_lower:
-                parts = message_lower.split('from')[1].split('to')
-                if len(parts) >= 2:
-                    from_part = parts[0].strip()
-                    to_part = parts[1].strip()
-                    
-                    for keyword, building_name in building_keywords.items():
-                        if keyword in from_part:
-                            start = building_name
-                        if keyword in to_part:
-                            end = building_name
+                from_part, _, to_part = message_lower.split('from', 1)[1].partition(' to ')
+                
+                # Later keywords take precedence, as with the old overwrite loop
+                from_matches = mentioned_buildings(from_part)
+                to_matches = mentioned_buildings(to_part)
+                if from_matches:
+                    start = from_matches[-1]
+                if to_matches:
+                    end = to_matches[-1]
             else:
                 # Find any building mentioned and assume Student Center as start
-                for keyword, building_name in building_keywords.items():
-                    if keyword in message_lower:
-                        end = building_name
-                        start = 'Student Center'  # Central location as default
-                        break
+                matches = mentioned_buildings(message_lower)
+                if matches:
+                    end = matches[0]
+                    start = 'Student Center'  # Central location as default
             
             if start and end and start in CAMPUS_BUILDINGS and end in CAMPUS_BUILDINGS:
                 # Find path using A* algorithm
-                path_func = ALGORITHMS['A*']
-                path, cost, steps = path_func(campus_graph, start, end)
+                path, cost = _astar_cached(start, end)
                 
                 if path is None:
                     return jsonify({
@@ -733,6 +1206,16 @@ def chatbot_query():
             'response': "I'm sorry, I encountered an error. Please try again."
         }), 500
 
+# The buildings object in campus-data.js: entries are one level deep ({lat, lng, type}), so the
+# regex only has to allow non-nested inner braces. Each alternative starts on a different
+# character, which keeps backtracking linear when the object is malformed.
+BUILDINGS_START_MARKER = 'buildings: {'
+BUILDINGS_BLOCK_RE = re.compile(re.escape(BUILDINGS_START_MARKER) + r'(?:[^{}]|\{[^{}]*\})*\}')
+
+# Byte span of the buildings object as of our last write, tagged with the file's mtime and size
+# so that any outside edit invalidates it
+_buildings_span_cache = {}
+
 @app.route('/api/save-buildings', methods=['POST'])
 def save_buildings():
     """Save building data to campus-data.js file"""
@@ -743,49 +1226,58 @@ def save_buildings():
         # Path to campus-data.js file
         campus_data_path = os.path.join(os.path.dirname(__file__), '..', 'frontend', 'js', 'campus-data.js')
         
-        # Read current file content
-        with open(campus_data_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Find and replace the buildings object
-        start_marker = 'buildings: {'
-        end_marker = '},'
-        
-        start_idx = content.find(start_marker)
-        if start_idx == -1:
-            return jsonify({'success': False, 'error': 'Could not find buildings object'}), 400
-        
-        # Find the end of buildings object (looking for the closing brace followed by comma)
-        brace_count = 0
-        end_idx = -1
-        for i in range(start_idx + len(start_marker), len(content)):
-            if content[i] == '{':
-                brace_count += 1
-            elif content[i] == '}':
-                if brace_count == 0:
-                    end_idx = i + 1
-                    break
-                brace_count -= 1
-        
-        if end_idx == -1:
-            return jsonify({'success': False, 'error': 'Could not find end of buildings object'}), 400
-        
-        # Build new buildings string
-        buildings_str = 'buildings: {\n'
-        for name, data in buildings.items():
-            buildings_str += f'        "{name}": {{\n'
-            buildings_str += f'            "lat": {data["lat"]},\n'
-            buildings_str += f'            "lng": {data["lng"]},\n'
-            buildings_str += f'            "type": "{data.get("type", "building")}"\n'
-            buildings_str += '        },\n'
-        buildings_str += '    }'
-        
-        # Replace the content
-        new_content = content[:start_idx] + buildings_str + content[end_idx:]
-        
-        # Write back to file
-        with open(campus_data_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        # Build new buildings string (one f-string per building, joined once)
+        parts = ['buildings: {\n']
+        parts.extend(
+            f'        "{name}": {{\n'
+            f'            "lat": {building["lat"]},\n'
+            f'            "lng": {building["lng"]},\n'
+            f'            "type": "{building.get("type", "building")}"\n'
+            f'        }},\n'
+            for name, building in buildings.items()
+        )
+        parts.append('    }')
+        buildings_bytes = ''.join(parts).encode('utf-8')
+        
+        span = _buildings_span_cache
+        stat = os.stat(campus_data_path)
+        if (span.get('mtime_ns') == stat.st_mtime_ns and span.get('size') == stat.st_size
+                and span['end'] - span['start'] == len(buildings_bytes)):
+            # The file is as we last wrote it and the block kept its length (the usual
+            # lat/lng nudge), so overwrite just that byte range in place
+            with open(campus_data_path, 'r+b') as f:
+                f.seek(span['start'])
+                f.write(buildings_bytes)
+        else:
+            # Read current file content
+            with open(campus_data_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            # Find and replace the buildings object
+            start_idx = content.find(BUILDINGS_START_MARKER)
+            if start_idx == -1:
+                return jsonify({'success': False, 'error': 'Could not find buildings object'}), 400
+            
+            # Find the end of buildings object (its matching closing brace)
+            match = BUILDINGS_BLOCK_RE.match(content, start_idx)
+            if not match:
+                return jsonify({'success': False, 'error': 'Could not find end of buildings object'}), 400
+            
+            # Replace the content
+            prefix = content[:start_idx].encode('utf-8')
+            suffix = content[match.end():].encode('utf-8')
+            
+            # Write back to file: hand the whole blob to a binary writer, which passes anything
+            # larger than its buffer straight to a single write() (no fsync; it's a dev file)
+            with open(campus_data_path, 'wb') as f:
+                f.write(prefix + buildings_bytes + suffix)
+            
+            span['start'] = len(prefix)
+            span['end'] = len(prefix) + len(buildings_bytes)
+        
+        stat = os.stat(campus_data_path)
+        span['mtime_ns'] = stat.st_mtime_ns
+        span['size'] = stat.st_size
         
         logger.info(f"Saved {len(buildings)} buildings to campus-data.js")
         
@@ -804,35 +1296,216 @@ def save_buildings():
 
 # ===== CUSTOM PATH MANAGEMENT ENDPOINTS =====
 
+# Saved paths live in memory and are persisted write-behind: handlers mutate SAVED_PATHS under
+# the lock, record the change and mark it dirty, and a background thread coalesces bursts of
+# edits into one atomic rewrite of the JSON file. Every worker process shares that file, so a
+# flush merges only this process's changes into it under a file lock
+SAVED_PATHS_FILE = os.environ.get('SAVED_PATHS_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'saved_paths.json'))
+SAVED_PATHS_FLUSH_DELAY = 0.5  # seconds
+SAVED_PATHS_MAX = int(os.environ.get('SAVED_PATHS_MAX', 10000))  # least recently used paths are evicted past this
+SAVED_PATHS_LOCK = threading.Lock()
+_saved_paths_dirty = threading.Event()
+_saved_paths_changes = {}  # name -> path (None once deleted) changed here since the last flush
+_next_path_id = itertools.count(1)  # ids are never reused, unlike len(SAVED_PATHS) + 1 after a delete
+
+def _read_saved_paths_file():
+    """
+    Read the persisted paths in recency order (empty if the file does not exist yet).
+    Raises ValueError when the file is not valid saved-paths JSON.
+    """
+    try:
+        with open(SAVED_PATHS_FILE, 'rb') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return OrderedDict()
+    
+    # A list of [name, path] pairs in recency order; older files hold a plain object
+    if isinstance(data, dict):
+        pairs = list(data.items())
+    elif isinstance(data, list) and all(isinstance(pair, list) and len(pair) == 2 for pair in data):
+        pairs = data
+    else:
+        raise ValueError('expected a list of [name, path] pairs')
+    if not all(isinstance(name, str) and isinstance(path, dict) for name, path in pairs):
+        raise ValueError('each saved path must be an object keyed by its name')
+    return OrderedDict(pairs)
+
+def load_saved_paths():
+    """Load previously saved paths from disk, if any"""
+    global _next_path_id
+    try:
+        SAVED_PATHS.update(_read_saved_paths_file())
+        _evict_saved_paths()
+        # Continue numbering after the persisted paths so ids stay unique across restarts
+        ids = (path.get('id') for path in SAVED_PATHS.values())
+        _next_path_id = itertools.count(max((i for i in ids if isinstance(i, int)), default=0) + 1)
+        logger.info(f"Loaded {len(SAVED_PATHS)} saved paths from {SAVED_PATHS_FILE}")
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Could not load saved paths from {SAVED_PATHS_FILE}: {e}")
+
+def _evict_saved_paths():
+    """Drop least recently used paths beyond SAVED_PATHS_MAX (caller holds the lock)"""
+    while len(SAVED_PATHS) > SAVED_PATHS_MAX:
+        SAVED_PATHS.popitem(last=False)
+
+def _apply_saved_path_changes(paths, changes):
+    """Apply recorded saves/updates (moved to most recent) and deletes to paths in place"""
+    for name, path in changes.items():
+        paths.pop(name, None)
+        if path is not None:
+            paths[name] = path
+
+@contextmanager
+def _saved_paths_file_lock():
+    """Hold an exclusive lock shared by every process flushing SAVED_PATHS_FILE"""
+    if not FCNTL_AVAILABLE:
+        yield  # no cross-process lock on this platform; run a single worker
+        return
+    with open(SAVED_PATHS_FILE + '.lock', 'ab') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def flush_saved_paths():
+    """
+    Merge this process's changes into the saved paths file and atomically replace it
+    (no fsync). Paths saved by other workers are kept and picked up into SAVED_PATHS.
+    """
+    with SAVED_PATHS_LOCK:
+        changes = _saved_paths_changes.copy()
+        _saved_paths_changes.clear()
+    
+    try:
+        with _saved_paths_file_lock():
+            try:
+                merged = _read_saved_paths_file()
+            except ValueError as e:
+                logger.warning(f"⚠️ Rewriting unreadable {SAVED_PATHS_FILE} from memory: {e}")
+                with SAVED_PATHS_LOCK:
+                    merged = OrderedDict(SAVED_PATHS)
+            _apply_saved_path_changes(merged, changes)
+            while len(merged) > SAVED_PATHS_MAX:
+                merged.popitem(last=False)
+            
+            with SAVED_PATHS_LOCK:  # handlers edit path dicts in place under this lock
+                # Pairs rather than an object so the sorted-keys JSON provider keeps recency order
+                body = app.json.dumps(list(merged.items())).encode('utf-8')
+            
+            # A private temp file per flush, so concurrent writers never share one
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(SAVED_PATHS_FILE), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, SAVED_PATHS_FILE)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+    except BaseException:
+        # Keep the changes for the next flush, behind any made since
+        with SAVED_PATHS_LOCK:
+            for name, path in changes.items():
+                _saved_paths_changes.setdefault(name, path)
+        raise
+    
+    with SAVED_PATHS_LOCK:
+        # Take in other workers' paths, keeping edits made here while the file was written
+        _apply_saved_path_changes(merged, _saved_paths_changes)
+        SAVED_PATHS.clear()
+        SAVED_PATHS.update(merged)
+        _evict_saved_paths()
+
+def _saved_paths_writer():
+    """Background loop that flushes saved paths shortly after they change"""
+    while True:
+        _saved_paths_dirty.wait()
+        time.sleep(SAVED_PATHS_FLUSH_DELAY)
+        # Clear before writing so edits made during the write trigger another flush
+        _saved_paths_dirty.clear()
+        try:
+            flush_saved_paths()
+        except Exception:
+            # The changes were put back for the next flush; keep the writer alive to retry
+            logger.exception("❌ Error persisting saved paths")
+
+def _flush_saved_paths_at_exit():
+    if _saved_paths_changes:
+        try:
+            flush_saved_paths()
+        except Exception:
+            logger.exception("❌ Error persisting saved paths at exit")
+
+load_saved_paths()
+threading.Thread(target=_saved_paths_writer, name='saved-paths-writer', daemon=True).start()
+atexit.register(_flush_saved_paths_at_exit)
+
+if MSGSPEC_AVAILABLE:
+    from typing import Annotated, List, Optional, TypedDict
+    
+    class CoordinateIn(TypedDict):
+        lat: float
+        lng: float
+    
+    class PathIn(msgspec.Struct):
+        """Body of /api/save-path"""
+        name: Annotated[str, msgspec.Meta(min_length=1)]
+        coordinates: Annotated[List[CoordinateIn], msgspec.Meta(min_length=1)]
+        description: str = ''
+    
+    class PathUpdateIn(msgspec.Struct):
+        """Body of /api/update-path; omitted fields are left unchanged"""
+        coordinates: Optional[List[CoordinateIn]] = None
+        description: Optional[str] = None
+    
+    # Parse and validate the raw request bytes in one pass (coordinates decode to plain dicts)
+    PATH_IN_DECODER = msgspec.json.Decoder(PathIn)
+    PATH_UPDATE_DECODER = msgspec.json.Decoder(PathUpdateIn)
+
 @app.route('/api/save-path', methods=['POST'])
 def save_custom_path():
     """Save a custom path created by the user."""
     try:
-        data = request.json
-        
-        # Validate required fields
-        if not data.get('name'):
-            return jsonify({'error': 'Path name is required'}), 400
-        
-        if not data.get('coordinates') or len(data['coordinates']) == 0:
-            return jsonify({'error': 'Path coordinates are required'}), 400
+        if MSGSPEC_AVAILABLE:
+            try:
+                body = PATH_IN_DECODER.decode(request.get_data())
+            except msgspec.DecodeError as e:
+                return jsonify({'error': str(e)}), 400
+            path_name, coordinates, description = body.name, body.coordinates, body.description
+        else:
+            data = request.json
+            
+            # Validate required fields
+            if not data.get('name'):
+                return jsonify({'error': 'Path name is required'}), 400
+            
+            if not data.get('coordinates') or len(data['coordinates']) == 0:
+                return jsonify({'error': 'Path coordinates are required'}), 400
+            
+            path_name = data['name']
+            coordinates = data['coordinates']
+            description = data.get('description', '')
         
-        path_name = data['name']
-        coordinates = data['coordinates']
-        description = data.get('description', '')
+        if isinstance(path_name, str):
+            path_name = sys.intern(path_name)  # stored key; later lookups by equal names probe faster
         
         # Create path object
         custom_path = {
-            'id': len(SAVED_PATHS) + 1,
+            'id': next(_next_path_id),
             'name': path_name,
             'coordinates': coordinates,
             'description': description,
-            'created_at': datetime.now().isoformat(),
+            'created_at': now_iso(),
             'coordinate_count': len(coordinates)
         }
         
         # Save to storage
-        SAVED_PATHS[path_name] = custom_path
+        with SAVED_PATHS_LOCK:
+            SAVED_PATHS[path_name] = custom_path
+            SAVED_PATHS.move_to_end(path_name)
+            _evict_saved_paths()
+            _saved_paths_changes[path_name] = custom_path
+        _saved_paths_dirty.set()
         
         logger.info(f"✅ Saved custom path: {path_name} with {len(coordinates)} coordinates")
         
@@ -847,17 +1520,35 @@ def save_custom_path():
         return jsonify({'error': str(e)}), 500
 
 
+GET_PATHS_CHUNK_SIZE = 64 * 1024  # bytes buffered per streamed write
+
+def stream_saved_paths(paths):
+    """Yield the get-paths JSON document in chunks, encoding each path separately"""
+    if ORJSON_AVAILABLE:
+        encode = lambda obj: orjson.dumps(obj, default=app.json.default, option=OrjsonProvider.OPTIONS)
+    else:
+        encode = lambda obj: app.json.dumps(obj).encode('utf-8')
+    
+    buffer = bytearray(b'{"paths":[')
+    for i, path in enumerate(paths):
+        if i:
+            buffer += b','
+        buffer += encode(path)
+        if len(buffer) >= GET_PATHS_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b'],"success":true,"total_paths":%d}\n' % len(paths)
+    yield bytes(buffer)
+
 @app.route('/api/get-paths', methods=['GET'])
 def get_saved_paths():
     """Retrieve all saved custom paths."""
     try:
-        paths_list = list(SAVED_PATHS.values())
+        with SAVED_PATHS_LOCK:
+            paths = list(SAVED_PATHS.values())
         
-        return jsonify({
-            'success': True,
-            'total_paths': len(paths_list),
-            'paths': paths_list
-        }), 200
+        # Same document jsonify would build (keys sorted), but streamed one path at a time
+        return Response(stream_saved_paths(paths), mimetype='application/json'), 200
         
     except Exception as e:
         logger.error(f"❌ Error retrieving paths: {str(e)}")
@@ -868,10 +1559,15 @@ def get_saved_paths():
 def get_path_by_name(path_name):
     """Retrieve a specific saved path by name."""
     try:
-        if path_name in SAVED_PATHS:
+        with SAVED_PATHS_LOCK:
+            path = SAVED_PATHS.get(path_name)
+            if path is not None:
+                SAVED_PATHS.move_to_end(path_name)
+        
+        if path is not None:
             return jsonify({
                 'success': True,
-                'path': SAVED_PATHS[path_name]
+                'path': path
             }), 200
         else:
             return jsonify({'error': f'Path "{path_name}" not found'}), 404
@@ -885,8 +1581,13 @@ def get_path_by_name(path_name):
 def delete_path(path_name):
     """Delete a saved custom path."""
     try:
-        if path_name in SAVED_PATHS:
-            deleted_path = SAVED_PATHS.pop(path_name)
+        with SAVED_PATHS_LOCK:
+            deleted_path = SAVED_PATHS.pop(path_name, None)
+            if deleted_path is not None:
+                _saved_paths_changes[path_name] = None
+        
+        if deleted_path is not None:
+            _saved_paths_dirty.set()
             logger.info(f"✅ Deleted custom path: {path_name}")
             
             return jsonify({
@@ -906,27 +1607,42 @@ def delete_path(path_name):
 def update_path(path_name):
     """Update an existing custom path."""
     try:
-        if path_name not in SAVED_PATHS:
-            return jsonify({'error': f'Path "{path_name}" not found'}), 404
-        
-        data = request.json
+        if MSGSPEC_AVAILABLE:
+            try:
+                body = PATH_UPDATE_DECODER.decode(request.get_data())
+            except msgspec.DecodeError as e:
+                return jsonify({'error': str(e)}), 400
+            coordinates, description = body.coordinates, body.description
+        else:
+            data = request.json
+            coordinates, description = data.get('coordinates'), data.get('description')
         
         # Update fields
-        if 'coordinates' in data and len(data['coordinates']) > 0:
-            SAVED_PATHS[path_name]['coordinates'] = data['coordinates']
-            SAVED_PATHS[path_name]['coordinate_count'] = len(data['coordinates'])
-        
-        if 'description' in data:
-            SAVED_PATHS[path_name]['description'] = data['description']
-        
-        SAVED_PATHS[path_name]['updated_at'] = datetime.now().isoformat()
+        # Look up and edit under one lock hold, so a concurrent delete or eviction is a 404
+        with SAVED_PATHS_LOCK:
+            path = SAVED_PATHS.get(path_name)
+            if path is None:
+                return jsonify({'error': f'Path "{path_name}" not found'}), 404
+            
+            if coordinates:
+                path['coordinates'] = coordinates
+                path['coordinate_count'] = len(coordinates)
+            
+            if description is not None:
+                path['description'] = description
+            
+            path['updated_at'] = now_iso()
+            SAVED_PATHS.move_to_end(path_name)
+            _saved_paths_changes[path_name] = path
+            updated_path = dict(path)  # snapshot; other threads may edit path once the lock is released
+        _saved_paths_dirty.set()
         
         logger.info(f"✅ Updated custom path: {path_name}")
         
         return jsonify({
             'success': True,
             'message': f'Path "{path_name}" updated successfully',
-            'path': SAVED_PATHS[path_name]
+            'path': updated_path
         }), 200
         
     except Exception as e:
@@ -9,10 +9,112 @@ Author: AI Assistant
 Date: September 19, 2025
 """
 
-import math
-from typing import Dict, List, Tuple, Optional
+import os
+import pickle
+import sys
+import tempfile
+from collections import Counter, namedtuple
+from types import MappingProxyType
+from typing import Dict, List, Tuple, Optional, Union
 import numpy as np
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Stand-in decorator so the kernels run as plain Python without Numba."""
+        return lambda func: func
+
+# Default location of the prebuilt graph written by ``python campus_graph.py --build-cache``
+GRAPH_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'campus_graph.pkl')
+
+# Operational details for one building; a namedtuple is much smaller than a per-building dict
+BuildingInfo = namedtuple('BuildingInfo', ('type', 'hours', 'description'))
+
+# Meters per pixel along x and y for the 824x1741 campus image
+METERS_PER_PIXEL = np.array([1000 / 824, 2000 / 1741])
+
+@njit(cache=True)
+def _dijkstra(indptr, indices, weights, src, dst):
+    """
+    Dijkstra over CSR arrays with a hand-rolled binary heap (Numba has no heapq).
+    
+    Args:
+        indptr, indices, weights: CSR adjacency from CampusGraph.get_csr()
+        src: Source node index
+        dst: Target node index; the search stops once it is settled
+        
+    Returns:
+        (dist, prev) arrays; unreachable nodes keep dist == int64 max and prev == -1
+    """
+    n = indptr.shape[0] - 1
+    unreachable = np.iinfo(np.int64).max
+    dist = np.full(n, unreachable, dtype=np.int64)
+    prev = np.full(n, -1, dtype=np.int32)
+    settled = np.zeros(n, dtype=np.bool_)
+    
+    # Each CSR entry pushes at most once, plus the source
+    heap_dist = np.empty(indices.shape[0] + 1, dtype=np.int64)
+    heap_node = np.empty(indices.shape[0] + 1, dtype=np.int32)
+    heap_dist[0] = 0
+    heap_node[0] = src
+    size = 1
+    dist[src] = 0
+    
+    while size > 0:
+        d = heap_dist[0]
+        u = heap_node[0]
+        
+        # Pop: move the last entry to the root and sift it down
+        size -= 1
+        last_dist = heap_dist[size]
+        last_node = heap_node[size]
+        i = 0
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap_dist[child + 1] < heap_dist[child]:
+                child += 1
+            if heap_dist[child] >= last_dist:
+                break
+            heap_dist[i] = heap_dist[child]
+            heap_node[i] = heap_node[child]
+            i = child
+        heap_dist[i] = last_dist
+        heap_node[i] = last_node
+        
+        if settled[u]:
+            continue
+        settled[u] = True
+        if u == dst:
+            break
+        
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            new_dist = d + weights[e]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                prev[v] = u
+                
+                # Push: append and sift up
+                i = size
+                size += 1
+                while i > 0:
+                    parent = (i - 1) // 2
+                    if heap_dist[parent] <= new_dist:
+                        break
+                    heap_dist[i] = heap_dist[parent]
+                    heap_node[i] = heap_node[parent]
+                    i = parent
+                heap_dist[i] = new_dist
+                heap_node[i] = v
+    
+    return dist, prev
+
 class CampusGraph:
     """
     Represents Chanakya University campus as a weighted graph.
@@ -21,15 +123,22 @@ class CampusGraph:
         nodes: Dictionary mapping node names to their properties
         edges: Dictionary representing the adjacency list with weights
         coordinates: Dictionary mapping node names to (x, y) coordinates
-        building_info: Dictionary containing building operational information
+        building_info: Read-only mapping of node names to BuildingInfo records
     """
     
+    __slots__ = ('nodes', 'edges', 'coordinates', 'building_info', '_euclidean_rows',
+                 '_name2idx', '_coord_arr', '_indptr', '_indices', '_weights',
+                 '_edge_count', '_type_counts', '_wmat', '_unreachable', '_dist_matrix',
+                 '_search_tables')
+    
     def __init__(self):
         """Initialize the campus graph with all buildings and connections."""
         self.nodes = {}
         self.edges = {}
         self.coordinates = {}
         self.building_info = {}
+        self._euclidean_rows = {}  # node -> distances to every node; coordinates never change
+        self._search_tables = None  # built by the first SearchAlgorithms on this graph, then shared
         self._initialize_campus()
     
     def _initialize_campus(self):
@@ -70,48 +179,129 @@ class CampusGraph:
         
         # Initialize building information
         self.building_info = {
-            'Entry Gate': {'type': 'entrance', 'hours': '24/7', 'description': 'Main campus entry point'},
-            'Main Gate': {'type': 'entrance', 'hours': '24/7', 'description': 'Primary campus gate with security'},
-            'Security Office': {'type': 'security', 'hours': '24/7', 'description': 'Campus security headquarters'},
-            'Flag Post': {'type': 'landmark', 'hours': '24/7', 'description': 'Central campus landmark'},
-            'Library': {'type': 'academic', 'hours': '8:00 AM - 10:00 PM', 'description': 'Central library with study halls'},
-            'Block A': {'type': 'academic', 'hours': '8:00 AM - 8:00 PM', 'description': 'Main academic building'},
-            'Block B': {'type': 'academic', 'hours': '8:00 AM - 8:00 PM', 'description': 'Secondary academic building'},
-            'Auditorium': {'type': 'academic', 'hours': '8:00 AM - 10:00 PM', 'description': 'Main auditorium for events'},
-            'Food Court': {'type': 'dining', 'hours': '7:00 AM - 11:00 PM', 'description': 'Central food court'},
-            'Gym': {'type': 'sports', 'hours': '6:00 AM - 10:00 PM', 'description': 'Fitness center and gymnasium'},
-            'Badminton Court': {'type': 'sports', 'hours': '6:00 AM - 10:00 PM', 'description': 'Indoor badminton facilities'},
-            'Boys Hostel': {'type': 'residential', 'hours': '24/7', 'description': 'Male student accommodation'},
-            'Girls Hostel': {'type': 'residential', 'hours': '24/7', 'description': 'Female student accommodation'},
-            'Mart': {'type': 'retail', 'hours': '8:00 AM - 10:00 PM', 'description': 'Campus convenience store'},
-            'Cricket Ground': {'type': 'sports', 'hours': '6:00 AM - 8:00 PM', 'description': 'Full-size cricket ground'},
-            'Football Ground': {'type': 'sports', 'hours': '6:00 AM - 8:00 PM', 'description': 'Football field'},
-            'Volleyball Court': {'type': 'sports', 'hours': '6:00 AM - 8:00 PM', 'description': 'Volleyball court'},
-            'Basketball Court': {'type': 'sports', 'hours': '6:00 AM - 8:00 PM', 'description': 'Basketball court'},
-            'Tennis Court': {'type': 'sports', 'hours': '6:00 AM - 8:00 PM', 'description': 'Tennis facilities'},
-            'Guest House': {'type': 'accommodation', 'hours': '24/7', 'description': 'Visitor accommodation'},
-            'Pottery Making Area': {'type': 'workshop', 'hours': '9:00 AM - 5:00 PM', 'description': 'Art and pottery workshop'},
-            'Faculty Apartment': {'type': 'residential', 'hours': '24/7', 'description': 'Faculty housing complex'},
-            'DG Yard': {'type': 'utility', 'hours': '24/7', 'description': 'Power generation facility'},
-            'Water Treatment Area': {'type': 'utility', 'hours': '24/7', 'description': 'Water treatment plant'},
-            'Exit Gate': {'type': 'entrance', 'hours': '24/7', 'description': 'Alternative campus exit'},
-            'Playing Ground': {'type': 'recreation', 'hours': '6:00 AM - 8:00 PM', 'description': 'General sports area'},
-            'Medical Center': {'type': 'medical', 'hours': '8:00 AM - 8:00 PM', 'description': 'Campus health center'},
-            'Admin Office': {'type': 'administrative', 'hours': '9:00 AM - 5:00 PM', 'description': 'Administration office'},
-            'Student Center': {'type': 'student services', 'hours': '8:00 AM - 8:00 PM', 'description': 'Student activities center'},
-            'Canteen': {'type': 'dining', 'hours': '7:00 AM - 10:00 PM', 'description': 'Student canteen'}
+            'Entry Gate': BuildingInfo('entrance', '24/7', 'Main campus entry point'),
+            'Main Gate': BuildingInfo('entrance', '24/7', 'Primary campus gate with security'),
+            'Security Office': BuildingInfo('security', '24/7', 'Campus security headquarters'),
+            'Flag Post': BuildingInfo('landmark', '24/7', 'Central campus landmark'),
+            'Library': BuildingInfo('academic', '8:00 AM - 10:00 PM', 'Central library with study halls'),
+            'Block A': BuildingInfo('academic', '8:00 AM - 8:00 PM', 'Main academic building'),
+            'Block B': BuildingInfo('academic', '8:00 AM - 8:00 PM', 'Secondary academic building'),
+            'Auditorium': BuildingInfo('academic', '8:00 AM - 10:00 PM', 'Main auditorium for events'),
+            'Food Court': BuildingInfo('dining', '7:00 AM - 11:00 PM', 'Central food court'),
+            'Gym': BuildingInfo('sports', '6:00 AM - 10:00 PM', 'Fitness center and gymnasium'),
+            'Badminton Court': BuildingInfo('sports', '6:00 AM - 10:00 PM', 'Indoor badminton facilities'),
+            'Boys Hostel': BuildingInfo('residential', '24/7', 'Male student accommodation'),
+            'Girls Hostel': BuildingInfo('residential', '24/7', 'Female student accommodation'),
+            'Mart': BuildingInfo('retail', '8:00 AM - 10:00 PM', 'Campus convenience store'),
+            'Cricket Ground': BuildingInfo('sports', '6:00 AM - 8:00 PM', 'Full-size cricket ground'),
+            'Football Ground': BuildingInfo('sports', '6:00 AM - 8:00 PM', 'Football field'),
+            'Volleyball Court': BuildingInfo('sports', '6:00 AM - 8:00 PM', 'Volleyball court'),
+            'Basketball Court': BuildingInfo('sports', '6:00 AM - 8:00 PM', 'Basketball court'),
+            'Tennis Court': BuildingInfo('sports', '6:00 AM - 8:00 PM', 'Tennis facilities'),
+            'Guest House': BuildingInfo('accommodation', '24/7', 'Visitor accommodation'),
+            'Pottery Making Area': BuildingInfo('workshop', '9:00 AM - 5:00 PM', 'Art and pottery workshop'),
+            'Faculty Apartment': BuildingInfo('residential', '24/7', 'Faculty housing complex'),
+            'DG Yard': BuildingInfo('utility', '24/7', 'Power generation facility'),
+            'Water Treatment Area': BuildingInfo('utility', '24/7', 'Water treatment plant'),
+            'Exit Gate': BuildingInfo('entrance', '24/7', 'Alternative campus exit'),
+            'Playing Ground': BuildingInfo('recreation', '6:00 AM - 8:00 PM', 'General sports area'),
+            'Medical Center': BuildingInfo('medical', '8:00 AM - 8:00 PM', 'Campus health center'),
+            'Admin Office': BuildingInfo('administrative', '9:00 AM - 5:00 PM', 'Administration office'),
+            'Student Center': BuildingInfo('student services', '8:00 AM - 8:00 PM', 'Student activities center'),
+            'Canteen': BuildingInfo('dining', '7:00 AM - 10:00 PM', 'Student canteen')
         }
         
+        # Intern the building names so every dict below (and the edge dicts) shares one
+        # string object per name and lookups hit the identity fast path
+        self.coordinates = {sys.intern(name): xy for name, xy in self.coordinates.items()}
+        self.building_info = MappingProxyType({sys.intern(name): info for name, info in self.building_info.items()})
+        
+        # Coordinates as one (N, 2) pixel array plus a name -> row index, for vectorized distances
+        self._name2idx = {name: i for i, name in enumerate(self.coordinates)}
+        self._coord_arr = np.array(list(self.coordinates.values()), dtype=np.float64)
+        
         # Initialize nodes
         for node_name in self.coordinates.keys():
             self.nodes[node_name] = {
                 'coordinates': self.coordinates[node_name],
-                'info': self.building_info.get(node_name, {})
+                'info': self.building_info.get(node_name)
             }
             self.edges[node_name] = {}
         
         # Add connections based on provided measurements
         self._add_campus_connections()
+        
+        # Flat CSR copy of the adjacency (indptr/indices/weights) for array-based consumers
+        self._build_csr()
+        
+        # The graph is fixed after construction, so its summary statistics are too
+        self._edge_count = len(self._indices) // 2
+        self._type_counts = Counter(info.type for info in self.building_info.values())
+        
+        # Dense edge weights (N is small), used for vectorized path sums
+        self._build_weight_matrix()
+        
+        # All-pairs shortest distances, so multi-hop distance queries are a single lookup
+        self._compute_all_pairs_distances()
+        
+        self._warm_kernels()
+    
+    def _warm_kernels(self):
+        """Compile (or load the cached build of) the Dijkstra kernel now rather than on first query."""
+        if NUMBA_AVAILABLE:
+            _dijkstra(self._indptr, self._indices, self._weights, 0, 0)
+    
+    def __getstate__(self):
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['building_info'] = dict(self.building_info)  # mappingproxy does not pickle
+        # Search tables belong to search_algorithms.py, which the cache's freshness check
+        # does not cover; they are rebuilt on first use instead
+        del state['_search_tables']
+        return state
+    
+    def __setstate__(self, state):
+        state['building_info'] = MappingProxyType(state['building_info'])
+        state['_search_tables'] = None
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    @classmethod
+    def from_cache(cls, path: str = GRAPH_CACHE_PATH) -> 'CampusGraph':
+        """
+        Load a graph written by save_cache(), skipping the campus build.
+        
+        Falls back to building the graph (and refreshing the cache) when the file
+        is missing, older than this module, or cannot be loaded at all (e.g. written
+        by an incompatible numpy or Python build).
+        """
+        try:
+            if os.path.getmtime(path) >= os.path.getmtime(__file__):
+                with open(path, 'rb') as f:
+                    graph = pickle.load(f)
+                if isinstance(graph, cls):
+                    graph._warm_kernels()
+                    return graph
+        except Exception:
+            pass  # any unusable cache just means rebuilding
+        
+        graph = cls()
+        try:
+            graph.save_cache(path)
+        except OSError:
+            pass  # read-only deploy; the built graph is still usable
+        return graph
+    
+    def save_cache(self, path: str = GRAPH_CACHE_PATH):
+        """Write the fully built graph to path for from_cache()."""
+        # A private temp file, so processes refreshing the cache at once never share one
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
     
     def _add_campus_connections(self):
         """Add all campus connections with measured distances."""
@@ -172,10 +362,62 @@ class CampusGraph:
         
         # Add bidirectional edges
         for node1, node2, distance in connections:
+            node1, node2 = sys.intern(node1), sys.intern(node2)
             if node1 in self.nodes and node2 in self.nodes:
                 self.edges[node1][node2] = distance
                 self.edges[node2][node1] = distance
     
+    def _build_csr(self):
+        """Build CSR arrays (row offsets, neighbor indices, weights) from the edge dicts."""
+        names = list(self._name2idx)
+        degrees = [len(self.edges[name]) for name in names]
+        num_entries = sum(degrees)
+        
+        self._indptr = np.zeros(len(names) + 1, dtype=np.int32)
+        np.cumsum(degrees, out=self._indptr[1:])
+        # Rows keep each edge dict's insertion order, so they list neighbors like get_neighbors()
+        self._indices = np.fromiter(
+            (self._name2idx[neighbor] for name in names for neighbor in self.edges[name]),
+            dtype=np.int32, count=num_entries
+        )
+        self._weights = np.fromiter(
+            (distance for name in names for distance in self.edges[name].values()),
+            dtype=np.int32, count=num_entries
+        )
+    
+    def get_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the adjacency in CSR form.
+        
+        Returns:
+            (indptr, indices, weights) int32 arrays; the neighbors of node i are
+            indices[indptr[i]:indptr[i + 1]], with node order as in get_all_nodes()
+        """
+        return self._indptr, self._indices, self._weights
+    
+    def _build_weight_matrix(self):
+        """Build the dense (N, N) direct-edge weight matrix from the CSR arrays."""
+        n = len(self._name2idx)
+        
+        # Half of int32 max marks "no edge", so adding two such entries cannot overflow
+        self._unreachable = np.iinfo(np.int32).max // 2
+        self._wmat = np.full((n, n), self._unreachable, dtype=np.int32)
+        rows = np.repeat(np.arange(n), np.diff(self._indptr))
+        self._wmat[rows, self._indices] = self._weights
+    
+    def _compute_all_pairs_distances(self):
+        """Fill the all-pairs shortest distance matrix with Floyd-Warshall."""
+        n = len(self._name2idx)
+        
+        dist = self._wmat.copy()
+        np.fill_diagonal(dist, 0)
+        
+        # Relax every pair through each intermediate node k in one broadcast step
+        for k in range(n):
+            np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+        
+        self._dist_matrix = dist
+    
     def get_neighbors(self, node: str) -> Dict[str, int]:
         """
         Get all neighbors of a node with their distances.
@@ -201,6 +443,23 @@ class CampusGraph:
         """
         return self.edges.get(node1, {}).get(node2)
     
+    def get_shortest_distance(self, node1: str, node2: str) -> Optional[int]:
+        """
+        Get the shortest walking distance between any two nodes.
+        
+        Args:
+            node1: First node name
+            node2: Second node name
+            
+        Returns:
+            Distance in meters, float('inf') if unreachable, None for unknown nodes
+        """
+        if node1 not in self._name2idx or node2 not in self._name2idx:
+            return None
+        
+        distance = int(self._dist_matrix[self._name2idx[node1], self._name2idx[node2]])
+        return float('inf') if distance >= self._unreachable else distance
+    
     def euclidean_distance(self, node1: str, node2: str) -> float:
         """
         Calculate Euclidean distance between two nodes (for heuristic).
@@ -212,21 +471,46 @@ class CampusGraph:
         Returns:
             Euclidean distance in coordinate units
         """
-        if node1 not in self.coordinates or node2 not in self.coordinates:
+        if node1 not in self._name2idx or node2 not in self._name2idx:
             return float('inf')
         
-        x1, y1 = self.coordinates[node1]
-        x2, y2 = self.coordinates[node2]
+        row = self._euclidean_rows.get(node1)
+        if row is None:
+            row = self._euclidean_rows[node1] = self.euclidean_to_all(node1).tolist()
+        return row[self._name2idx[node2]]
+    
+    def euclidean_distance_sq(self, node1: str, node2: str) -> float:
+        """
+        Squared Euclidean distance, for callers that only compare magnitudes.
         
-        # Convert pixel coordinates to approximate meters
-        # Assuming the image represents approximately 1000m x 2000m campus
-        scale_x = 1000 / 824  # meters per pixel
-        scale_y = 2000 / 1741  # meters per pixel
+        Not a heuristic: A* needs the true distance to stay admissible.
         
-        dx = (x2 - x1) * scale_x
-        dy = (y2 - y1) * scale_y
+        Args:
+            node1: First node name
+            node2: Second node name
+            
+        Returns:
+            Squared distance in square meters
+        """
+        if node1 not in self._name2idx or node2 not in self._name2idx:
+            return float('inf')
         
-        return math.sqrt(dx * dx + dy * dy)
+        dx, dy = ((self._coord_arr[self._name2idx[node1]] - self._coord_arr[self._name2idx[node2]]) * METERS_PER_PIXEL).tolist()
+        return dx * dx + dy * dy
+    
+    def euclidean_to_all(self, node: str) -> np.ndarray:
+        """
+        Calculate Euclidean distances from one node to every node in one vectorized pass.
+        
+        Args:
+            node: Node name
+            
+        Returns:
+            Array of distances in meters, ordered like get_all_nodes()
+        """
+        # Pixel offsets to approximate meters, assuming the image is about 1000m x 2000m
+        delta = (self._coord_arr - self._coord_arr[self._name2idx[node]]) * METERS_PER_PIXEL
+        return np.hypot(delta[:, 0], delta[:, 1])
     
     def get_all_nodes(self) -> List[str]:
         """Get list of all node names."""
@@ -236,42 +520,73 @@ class CampusGraph:
         """Check if node exists in the graph."""
         return node in self.nodes
     
-    def get_node_info(self, node: str) -> Dict:
-        """Get detailed information about a node."""
+    def get_node_info(self, node: str) -> Dict[str, Union[Tuple[int, int], Optional[BuildingInfo]]]:
+        """
+        Get detailed information about a node.
+        
+        Args:
+            node: Node name
+            
+        Returns:
+            {'coordinates': (x, y) tuple, 'info': BuildingInfo record or None}, or an
+            empty dict for an unknown node. Use info._asdict() where a dict is needed.
+        """
         return self.nodes.get(node, {})
     
     def get_building_hours(self, node: str) -> str:
         """Get operating hours for a building."""
-        info = self.building_info.get(node, {})
-        return info.get('hours', 'Unknown')
+        info = self.building_info.get(node)
+        return info.hours if info is not None else 'Unknown'
     
     def get_building_type(self, node: str) -> str:
         """Get building type/category."""
-        info = self.building_info.get(node, {})
-        return info.get('type', 'Unknown')
+        info = self.building_info.get(node)
+        return info.type if info is not None else 'Unknown'
     
     def get_building_description(self, node: str) -> str:
         """Get building description."""
-        info = self.building_info.get(node, {})
-        return info.get('description', 'No description available')
+        info = self.building_info.get(node)
+        return info.description if info is not None else 'No description available'
     
     def print_graph_stats(self):
         """Print graph statistics."""
         print(f"Campus Graph Statistics:")
         print(f"- Total nodes: {len(self.nodes)}")
-        print(f"- Total edges: {sum(len(neighbors) for neighbors in self.edges.values()) // 2}")
-        print(f"- Building types: {len(set(info.get('type', 'Unknown') for info in self.building_info.values()))}")
-        
-        # Count by type
-        type_counts = {}
-        for info in self.building_info.values():
-            building_type = info.get('type', 'Unknown')
-            type_counts[building_type] = type_counts.get(building_type, 0) + 1
+        print(f"- Total edges: {self._edge_count}")
+        print(f"- Building types: {len(self._type_counts)}")
         
         print("\nBuilding distribution:")
-        for building_type, count in sorted(type_counts.items()):
+        for building_type, count in sorted(self._type_counts.items()):
             print(f"  - {building_type}: {count}")
     
+    def shortest_path(self, start: str, goal: str) -> Tuple[List[str], float]:
+        """
+        Find the shortest path with the compiled CSR Dijkstra kernel.
+        
+        Args:
+            start: Starting node name
+            goal: Goal node name
+            
+        Returns:
+            (path, distance in meters); ([], float('inf')) if unknown or unreachable
+        """
+        if start not in self._name2idx or goal not in self._name2idx:
+            return [], float('inf')
+        
+        src, dst = self._name2idx[start], self._name2idx[goal]
+        dist, prev = _dijkstra(self._indptr, self._indices, self._weights, src, dst)
+        if prev[dst] == -1 and src != dst:
+            return [], float('inf')
+        
+        names = list(self._name2idx)
+        path = []
+        node = dst
+        while node != -1:
+            path.append(names[node])
+            node = prev[node]
+        path.reverse()
+        return path, int(dist[dst])
+    
     def get_path_distance(self, path: List[str]) -> int:
         """
         Calculate total distance for a given path.
@@ -285,14 +600,16 @@ class CampusGraph:
         if len(path) < 2:
             return 0
         
-        total_distance = 0
-        for i in range(len(path) - 1):
-            distance = self.get_distance(path[i], path[i + 1])
-            if distance is None:
-                return float('inf')  # Invalid path
-            total_distance += distance
+        if any(node not in self._name2idx for node in path):
+            return float('inf')  # Invalid path
+        
+        # Gather every hop's weight in one fancy-index instead of a per-hop lookup loop
+        idx = np.fromiter((self._name2idx[node] for node in path), dtype=np.intp, count=len(path))
+        hops = self._wmat[idx[:-1], idx[1:]]
+        if hops.max() >= self._unreachable:
+            return float('inf')  # Invalid path
         
-        return total_distance
+        return int(hops.sum(dtype=np.int64))
     
     def estimate_walking_time(self, distance_meters: int, walking_speed_mps: float = 1.4) -> int:
         """
@@ -309,8 +626,17 @@ class CampusGraph:
 
 # Example usage and testing
 if __name__ == "__main__":
-    # Create campus graph
-    campus = CampusGraph()
+    # Use the class from the importable module, so cached pickles refer to
+    # campus_graph.CampusGraph rather than __main__.CampusGraph
+    from campus_graph import CampusGraph
+    
+    if '--build-cache' in sys.argv[1:]:
+        CampusGraph().save_cache()
+        print(f"Wrote {GRAPH_CACHE_PATH}")
+        sys.exit(0)
+    
+    # Load the campus graph (built and cached on first run)
+    campus = CampusGraph.from_cache()
     
     # Print statistics
     campus.print_graph_stats()
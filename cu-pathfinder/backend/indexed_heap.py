@@ -0,0 +1,92 @@
+"""
+CU PathFinder - Indexed Binary Heap
+===================================
+
+Array-backed binary min-heap over node ids with decrease-key, for Dijkstra-style
+searches that keep exactly one heap entry per node. The functions are compiled with
+Numba when it is installed (see campus_graph.NUMBA_AVAILABLE) and inlined into the
+compiled kernels that call them.
+
+State is three arrays sized to the number of nodes:
+    heap: node ids in heap order (the first `size` entries are live)
+    pos:  node id -> index in heap; NOT_IN_HEAP if never pushed, POPPED once removed
+    key:  node id -> current priority
+
+Entries are ordered by key, then by node id, so equal keys pop in id order.
+"""
+
+import numpy as np
+from campus_graph import njit
+
+NOT_IN_HEAP = -1
+POPPED = -2
+
+@njit(cache=True, nogil=True, inline="always")
+def make_heap(n):
+    """Allocate empty (heap, pos, key) arrays for node ids 0..n-1."""
+    heap = np.empty(n, dtype=np.int32)
+    pos = np.full(n, NOT_IN_HEAP, dtype=np.int32)
+    key = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+    return heap, pos, key
+
+@njit(cache=True, nogil=True, inline="always")
+def _less(key, a, b):
+    """Heap order between node ids a and b."""
+    if key[a] != key[b]:
+        return key[a] < key[b]
+    return a < b
+
+@njit(cache=True, nogil=True, inline="always")
+def _sift_up(heap, pos, key, i):
+    v = heap[i]
+    while i > 0:
+        parent = (i - 1) // 2
+        if not _less(key, v, heap[parent]):
+            break
+        heap[i] = heap[parent]
+        pos[heap[i]] = i
+        i = parent
+    heap[i] = v
+    pos[v] = i
+
+@njit(cache=True, nogil=True, inline="always")
+def _sift_down(heap, pos, key, size, i):
+    v = heap[i]
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and _less(key, heap[child + 1], heap[child]):
+            child += 1
+        if not _less(key, heap[child], v):
+            break
+        heap[i] = heap[child]
+        pos[heap[i]] = i
+        i = child
+    heap[i] = v
+    pos[v] = i
+
+@njit(cache=True, nogil=True, inline="always")
+def heap_push(heap, pos, key, size, v, k):
+    """Insert node v (not currently in the heap) with key k; returns the new size."""
+    key[v] = k
+    heap[size] = v
+    _sift_up(heap, pos, key, size)
+    return size + 1
+
+@njit(cache=True, nogil=True, inline="always")
+def heap_decrease(heap, pos, key, v, k):
+    """Lower the key of node v, which must be in the heap, to k."""
+    key[v] = k
+    _sift_up(heap, pos, key, pos[v])
+
+@njit(cache=True, nogil=True, inline="always")
+def heap_pop(heap, pos, key, size):
+    """Remove the minimum node; returns (node, new size). key[node] keeps its final value."""
+    v = heap[0]
+    pos[v] = POPPED
+    size -= 1
+    if size > 0:
+        heap[0] = heap[size]
+        _sift_down(heap, pos, key, size, 0)
+    return v, size
@@ -9,23 +9,27 @@ Author: AI Assistant
 Date: September 19, 2025
 """
 
-import heapq
-from collections import deque
-from typing import List, Tuple, Dict, Optional, Set
-from campus_graph import CampusGraph
+import numpy as np
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Tuple, Dict, Optional
+from campus_graph import CampusGraph, njit
+from indexed_heap import POPPED, heap_decrease, heap_pop, heap_push, make_heap
 
 class SearchResult:
     """Container for search algorithm results."""
     
-    def __init__(self, path: List[str], cost: int, nodes_explored: List[str], 
-                 exploration_order: List[str], algorithm: str, success: bool = True):
+    __slots__ = ("path", "cost", "exploration_order", "algorithm", "success", "num_nodes_explored")
+    
+    def __init__(self, path: List[str], cost: int, exploration_order: List[str], 
+                 algorithm: str, success: bool = True, num_nodes_explored: Optional[int] = None):
         self.path = path
         self.cost = cost
-        self.nodes_explored = nodes_explored
         self.exploration_order = exploration_order
         self.algorithm = algorithm
         self.success = success
-        self.num_nodes_explored = len(set(nodes_explored))
+        # Searches expand each node at most once, so the count is just the order's length
+        self.num_nodes_explored = len(exploration_order) if num_nodes_explored is None else num_nodes_explored
     
     def __str__(self):
         if not self.success:
@@ -39,6 +43,374 @@ class SearchResult:
                 f"Exploration Order: {' → '.join(self.exploration_order[:10])}..."
                 f"{'...' if len(self.exploration_order) > 10 else ''}")
 
+@njit(cache=True, nogil=True)
+def _key_less(f1, g1, n1, p1, f2, g2, n2, p2):
+    """Lexicographic order of (f, g, node, parent) frontier entries, as Python compares tuples."""
+    if f1 != f2:
+        return f1 < f2
+    if g1 != g2:
+        return g1 < g2
+    if n1 != n2:
+        return n1 < n2
+    return p1 < p2
+
+@njit(cache=True, nogil=True)
+def _breadth_first_search(indptr, indices, start, goal):
+    """
+    Level-synchronous BFS core over CSR arrays: each level's frontier is expanded in
+    order into the next level's frontier, and a node is marked when it is discovered.
+    
+    Nodes are explored in the same order as a FIFO queue of (node, parent) entries and
+    keep the parent that first reached them, without the duplicate queue entries.
+    
+    The search stops as soon as the goal is discovered rather than when it would be
+    dequeued: with unweighted hops the first route to reach it is already a fewest-hop
+    one. (UCS and A* must keep testing at pop time, since on weighted edges the first
+    route found to the goal need not be the cheapest.)
+    
+    Args:
+        indptr, indices: CSR adjacency (int32)
+        start, goal: Node ids
+        
+    Returns:
+        (parent, order, order_queue, count, found): parent ids (-1 for the start), the
+        first `count` explored nodes (ending with the goal when found) with the number of
+        nodes still waiting after each, and whether the goal was reached
+    """
+    n = indptr.shape[0] - 1
+    parent = np.full(n, -1, dtype=np.int32)
+    discovered = np.zeros(n, dtype=np.bool_)
+    order = np.empty(n, dtype=np.int32)
+    order_queue = np.empty(n, dtype=np.int64)
+    frontier = np.empty(n, dtype=np.int32)
+    next_frontier = np.empty(n, dtype=np.int32)
+    count = 0
+    frontier[0] = start
+    size = 1
+    discovered[start] = True
+    
+    if start == goal:
+        order[0] = start
+        order_queue[0] = 0
+        return parent, order, order_queue, 1, True
+    
+    while size > 0:
+        next_size = 0
+        for i in range(size):
+            u = frontier[i]
+            order[count] = u
+            order_queue[count] = size - i - 1 + next_size
+            count += 1
+            
+            for e in range(indptr[u], indptr[u + 1]):
+                v = indices[e]
+                if not discovered[v]:
+                    discovered[v] = True
+                    parent[v] = u
+                    if v == goal:
+                        order[count] = v
+                        order_queue[count] = size - i - 1 + next_size
+                        return parent, order, order_queue, count + 1, True
+                    next_frontier[next_size] = v
+                    next_size += 1
+        
+        frontier, next_frontier = next_frontier, frontier
+        size = next_size
+    
+    return parent, order, order_queue, count, False
+
+@njit(cache=True, nogil=True)
+def _uniform_cost_search(indptr, indices, weights, start, goal):
+    """
+    UCS (Dijkstra) core over CSR arrays with an indexed heap: each node has at most one
+    entry, whose key is lowered in place when a shorter route to it is found.
+    
+    Nodes are expanded by (cost, node id), the same order the lazy-deletion heap
+    produced; there are just no stale entries left to skip.
+    
+    Args:
+        indptr, indices, weights: CSR adjacency (int32)
+        start, goal: Node ids
+        
+    Returns:
+        (parent, order, order_g, order_queue, count, found): parent ids (-1 for the
+        start), the first `count` expanded nodes with their cost and the frontier size
+        after popping them, and whether the goal was reached
+    """
+    n = indptr.shape[0] - 1
+    heap, pos, cost = make_heap(n)
+    parent = np.full(n, -1, dtype=np.int32)
+    order = np.empty(n, dtype=np.int32)
+    order_g = np.empty(n, dtype=np.int64)
+    order_queue = np.empty(n, dtype=np.int64)
+    count = 0
+    size = heap_push(heap, pos, cost, 0, start, 0)
+    
+    while size > 0:
+        u, size = heap_pop(heap, pos, cost, size)
+        g = cost[u]
+        order[count] = u
+        order_g[count] = g
+        order_queue[count] = size
+        count += 1
+        if u == goal:
+            return parent, order, order_g, order_queue, count, True
+        
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            if pos[v] == POPPED:
+                continue
+            new_g = g + weights[e]
+            if new_g >= cost[v]:
+                continue
+            parent[v] = u
+            if pos[v] < 0:
+                size = heap_push(heap, pos, cost, size, v, new_g)
+            else:
+                heap_decrease(heap, pos, cost, v, new_g)
+    
+    return parent, order, order_g, order_queue, count, False
+
+@njit(cache=True, nogil=True)
+def _a_star_search(indptr, indices, weights, h, start, goal):
+    """
+    A* core over CSR arrays with a hand-rolled binary heap (Numba has no heapq).
+    Compiled with nogil, so searches from different threads run in parallel.
+    
+    Frontier entries are ordered by (g + h, g, node, parent) exactly like the Python
+    tuples they replace, so nodes are expanded in the same order. A neighbor is only
+    pushed when it improves its best known g-cost, which keeps dominated entries out
+    of the heap.
+    
+    Args:
+        indptr, indices, weights: CSR adjacency (int32)
+        h: Heuristic to the goal per node (float64)
+        start, goal: Node ids
+        
+    Returns:
+        (parent, order, order_g, order_f, order_queue, count, found): parent ids (-1 for
+        the start), the first `count` expanded nodes with their g, f and the frontier
+        size after popping them, and whether the goal was reached
+    """
+    n = indptr.shape[0] - 1
+    unreached = np.iinfo(np.int64).max
+    best_g = np.full(n, unreached, dtype=np.int64)
+    parent = np.full(n, -1, dtype=np.int32)
+    visited = np.zeros(n, dtype=np.bool_)
+    order = np.empty(n, dtype=np.int32)
+    order_g = np.empty(n, dtype=np.int64)
+    order_f = np.empty(n, dtype=np.float64)
+    order_queue = np.empty(n, dtype=np.int64)
+    count = 0
+    
+    # Each CSR entry pushes at most once, plus the start
+    capacity = indices.shape[0] + 1
+    heap_f = np.empty(capacity, dtype=np.float64)
+    heap_g = np.empty(capacity, dtype=np.int64)
+    heap_node = np.empty(capacity, dtype=np.int32)
+    heap_parent = np.empty(capacity, dtype=np.int32)
+    heap_f[0] = h[start]
+    heap_g[0] = 0
+    heap_node[0] = start
+    heap_parent[0] = -1
+    size = 1
+    best_g[start] = 0
+    
+    while size > 0:
+        f = heap_f[0]
+        g = heap_g[0]
+        u = heap_node[0]
+        p = heap_parent[0]
+        
+        # Pop: move the last entry to the root and sift it down
+        size -= 1
+        last_f = heap_f[size]
+        last_g = heap_g[size]
+        last_node = heap_node[size]
+        last_parent = heap_parent[size]
+        i = 0
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and _key_less(heap_f[child + 1], heap_g[child + 1], heap_node[child + 1], heap_parent[child + 1],
+                                              heap_f[child], heap_g[child], heap_node[child], heap_parent[child]):
+                child += 1
+            if not _key_less(heap_f[child], heap_g[child], heap_node[child], heap_parent[child],
+                             last_f, last_g, last_node, last_parent):
+                break
+            heap_f[i] = heap_f[child]
+            heap_g[i] = heap_g[child]
+            heap_node[i] = heap_node[child]
+            heap_parent[i] = heap_parent[child]
+            i = child
+        heap_f[i] = last_f
+        heap_g[i] = last_g
+        heap_node[i] = last_node
+        heap_parent[i] = last_parent
+        
+        if visited[u]:
+            continue
+        visited[u] = True
+        parent[u] = p
+        order[count] = u
+        order_g[count] = g
+        order_f[count] = f
+        order_queue[count] = size
+        count += 1
+        if u == goal:
+            return parent, order, order_g, order_f, order_queue, count, True
+        
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            if visited[v]:
+                continue
+            new_g = g + weights[e]
+            if best_g[v] <= new_g:
+                continue
+            best_g[v] = new_g
+            new_f = new_g + h[v]
+            
+            # Push: append and sift up
+            i = size
+            size += 1
+            while i > 0:
+                up = (i - 1) // 2
+                if not _key_less(new_f, new_g, v, u, heap_f[up], heap_g[up], heap_node[up], heap_parent[up]):
+                    break
+                heap_f[i] = heap_f[up]
+                heap_g[i] = heap_g[up]
+                heap_node[i] = heap_node[up]
+                heap_parent[i] = heap_parent[up]
+                i = up
+            heap_f[i] = new_f
+            heap_g[i] = new_g
+            heap_node[i] = v
+            heap_parent[i] = u
+    
+    return parent, order, order_g, order_f, order_queue, count, False
+
+@njit(cache=True, nogil=True)
+def _bidirectional_uniform_cost_search(indptr, indices, weights, start, goal):
+    """
+    Bidirectional Dijkstra over CSR arrays: one indexed heap grows from start, one from
+    goal, always popping the smaller top, until the tops together cannot beat the best
+    route found through a node reached from both sides. The campus graph is undirected,
+    so both directions use the same adjacency.
+    
+    Args:
+        indptr, indices, weights: CSR adjacency (int32)
+        start, goal: Node ids (distinct)
+        
+    Returns:
+        (parent_fwd, parent_bwd, meet, best, order, order_dir, order_g, order_queue, count):
+        parent ids in each direction (-1 at start / goal), the meeting node (-1 if goal is
+        unreachable) and the route cost, then the first `count` expansions with their
+        direction (0 forward, 1 backward), cost from that side and that heap's size after
+        the pop
+    """
+    n = indptr.shape[0] - 1
+    unreached = np.iinfo(np.int64).max
+    heap_fwd, pos_fwd, cost_fwd = make_heap(n)
+    heap_bwd, pos_bwd, cost_bwd = make_heap(n)
+    parent_fwd = np.full(n, -1, dtype=np.int32)
+    parent_bwd = np.full(n, -1, dtype=np.int32)
+    order = np.empty(2 * n, dtype=np.int32)
+    order_dir = np.empty(2 * n, dtype=np.int8)
+    order_g = np.empty(2 * n, dtype=np.int64)
+    order_queue = np.empty(2 * n, dtype=np.int64)
+    count = 0
+    size_fwd = heap_push(heap_fwd, pos_fwd, cost_fwd, 0, start, 0)
+    size_bwd = heap_push(heap_bwd, pos_bwd, cost_bwd, 0, goal, 0)
+    best = unreached
+    meet = -1
+    
+    while size_fwd > 0 and size_bwd > 0:
+        top_fwd = cost_fwd[heap_fwd[0]]
+        top_bwd = cost_bwd[heap_bwd[0]]
+        if top_fwd + top_bwd >= best:
+            break
+        
+        # Grow whichever side has the nearer frontier
+        if top_fwd <= top_bwd:
+            heap, pos, cost, parent = heap_fwd, pos_fwd, cost_fwd, parent_fwd
+            other_cost = cost_bwd
+            u, size_fwd = heap_pop(heap, pos, cost, size_fwd)
+            size = size_fwd
+            order_dir[count] = 0
+        else:
+            heap, pos, cost, parent = heap_bwd, pos_bwd, cost_bwd, parent_bwd
+            other_cost = cost_fwd
+            u, size_bwd = heap_pop(heap, pos, cost, size_bwd)
+            size = size_bwd
+            order_dir[count] = 1
+        g = cost[u]
+        order[count] = u
+        order_g[count] = g
+        order_queue[count] = size
+        count += 1
+        
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            if pos[v] == POPPED:
+                continue
+            new_g = g + weights[e]
+            if new_g < cost[v]:
+                parent[v] = u
+                if pos[v] < 0:
+                    size = heap_push(heap, pos, cost, size, v, new_g)
+                else:
+                    heap_decrease(heap, pos, cost, v, new_g)
+            if other_cost[v] != unreached and cost[v] + other_cost[v] < best:
+                best = cost[v] + other_cost[v]
+                meet = v
+        
+        if order_dir[count - 1] == 0:
+            size_fwd = size
+        else:
+            size_bwd = size
+    
+    return parent_fwd, parent_bwd, meet, best, order, order_dir, order_g, order_queue, count
+
+class _SearchTables:
+    """
+    A CampusGraph as integer CSR arrays for the search loops, stored on the graph and
+    shared by every SearchAlgorithms built on it.
+    
+    Nodes are renumbered in name order, so comparing ids in the priority queues
+    breaks cost ties exactly as comparing names did. Rows keep get_neighbors()
+    order. The DFS loop gets plain lists, because indexing them from Python is
+    much cheaper than indexing numpy arrays element by element.
+    """
+    
+    __slots__ = ('old_ids', 'id_to_name', 'name_to_id', 'csr', 'indptr', 'indices_rev',
+                 'heuristic_rows')
+    
+    def __init__(self, graph: CampusGraph):
+        names = graph.get_all_nodes()
+        indptr, indices, weights = graph.get_csr()
+        
+        old_ids = np.array(sorted(range(len(names)), key=names.__getitem__), dtype=np.int32)
+        new_ids = np.empty_like(old_ids)
+        new_ids[old_ids] = np.arange(len(names), dtype=np.int32)
+        
+        degrees = np.diff(indptr)[old_ids]
+        entries = np.concatenate([np.arange(indptr[i], indptr[i + 1]) for i in old_ids])
+        entries_rev = np.concatenate([np.arange(indptr[i + 1] - 1, indptr[i] - 1, -1) for i in old_ids])
+        
+        self.old_ids = old_ids
+        self.id_to_name = [names[i] for i in old_ids]
+        self.name_to_id = {name: i for i, name in enumerate(self.id_to_name)}
+        # int32 arrays for the compiled BFS / UCS / A* cores, lists for the DFS loop
+        self.csr = (
+            np.concatenate(([0], np.cumsum(degrees))).astype(np.int32),
+            new_ids[indices[entries]],
+            weights[entries],
+        )
+        self.indptr = self.csr[0].tolist()
+        self.indices_rev = new_ids[indices[entries_rev]].tolist()  # each row reversed, for DFS
+        self.heuristic_rows: Dict[int, np.ndarray] = {}  # goal id -> heuristic per node id
+
 class SearchAlgorithms:
     """Implementation of various search algorithms for campus pathfinding."""
     
@@ -51,6 +423,96 @@ class SearchAlgorithms:
         """
         self.graph = campus_graph
         self.trace_enabled = True
+        
+        # LRU of untraced results keyed by (algorithm, start, goal); one slot per node pair
+        self._result_cache: "OrderedDict[Tuple[str, str, str], SearchResult]" = OrderedDict()
+        self._result_cache_size = len(campus_graph.get_all_nodes()) ** 2
+        
+        # The graph never changes, so its search tables are built once and shared
+        tables = campus_graph._search_tables
+        if tables is None:
+            tables = campus_graph._search_tables = _SearchTables(campus_graph)
+        self._old_ids = tables.old_ids
+        self._id_to_name = tables.id_to_name
+        self._name_to_id = tables.name_to_id
+        self._csr = tables.csr
+        self._indptr = tables.indptr
+        self._indices_rev = tables.indices_rev
+        self._heuristic_rows = tables.heuristic_rows
+        
+        # LRU of full single-source UCS runs keyed by start id, for pathfind_many()
+        self._tree_cache: "OrderedDict[int, Tuple[List[int], List[int], List[int]]]" = OrderedDict()
+        self._tree_cache_size = 16
+    
+    def _heuristic_to(self, goal_id: int) -> np.ndarray:
+        """Euclidean heuristic from every node to goal_id, computed once per goal."""
+        h = self._heuristic_rows.get(goal_id)
+        if h is None:
+            h = self.graph.euclidean_to_all(self._id_to_name[goal_id])[self._old_ids]
+            self._heuristic_rows[goal_id] = h
+        return h
+    
+    def search(self, algorithm: str, start: str, goal: str) -> SearchResult:
+        """
+        Run one algorithm by name, reusing earlier results when tracing is off.
+        
+        Args:
+            algorithm: One of "BFS", "DFS", "UCS", "BiUCS", "A*"
+            start: Starting node name
+            goal: Goal node name
+            
+        Returns:
+            SearchResult for the query (shared with later identical queries)
+        """
+        methods = {
+            "BFS": self.breadth_first_search,
+            "DFS": self.depth_first_search,
+            "UCS": self.uniform_cost_search,
+            "BiUCS": self.bidirectional_uniform_cost_search,
+            "A*": self.a_star_search
+        }
+        
+        # Traced runs print as they explore, so they always search afresh
+        if self.trace_enabled:
+            return methods[algorithm](start, goal)
+        
+        key = (algorithm, start, goal)
+        result = self._result_cache.get(key)
+        if result is not None:
+            self._result_cache.move_to_end(key)
+            return result
+        
+        result = methods[algorithm](start, goal)
+        self._result_cache[key] = result
+        if len(self._result_cache) > self._result_cache_size:
+            self._result_cache.popitem(last=False)
+        return result
+    
+    @contextmanager
+    def _tracing(self, enabled: bool):
+        """Temporarily set tracing, restoring the previous setting even if a search raises."""
+        original_trace = self.trace_enabled
+        self.trace_enabled = enabled
+        try:
+            yield
+        finally:
+            self.trace_enabled = original_trace
+    
+    @staticmethod
+    def _print_trace(template: str, rows: Optional[List[tuple]]):
+        """Format and print buffered trace rows in one write (rows is None when tracing is off)."""
+        if rows:
+            print("\n".join(template.format(*row) for row in rows))
+    
+    def _reconstruct_path(self, parent: List[int], goal: int) -> List[str]:
+        """Walk predecessor ids back from goal to the start (whose parent is -1)."""
+        path = []
+        node = goal
+        while node != -1:
+            path.append(self._id_to_name[node])
+            node = parent[node]
+        path.reverse()
+        return path
     
     def breadth_first_search(self, start: str, goal: str) -> SearchResult:
         """
@@ -64,43 +526,26 @@ class SearchAlgorithms:
             SearchResult with path and exploration details
         """
         if not self.graph.is_valid_node(start) or not self.graph.is_valid_node(goal):
-            return SearchResult([], 0, [], [], "BFS", False)
+            return SearchResult([], 0, [], "BFS", False)
         
         if start == goal:
-            return SearchResult([start], 0, [start], [start], "BFS")
+            return SearchResult([start], 0, [start], "BFS")
         
-        # Initialize BFS data structures
-        queue = deque([(start, [start], 0)])  # (node, path, cost)
-        visited = set()
-        exploration_order = []
-        nodes_explored = []
+        goal_id = self._name_to_id[goal]
+        indptr, indices, _ = self._csr
+        parent, order, order_queue, count, found = _breadth_first_search(
+            indptr, indices, self._name_to_id[start], goal_id)
+        exploration_order = [self._id_to_name[i] for i in order[:count].tolist()]
         
-        while queue:
-            current_node, path, cost = queue.popleft()
-            
-            if current_node in visited:
-                continue
-            
-            visited.add(current_node)
-            exploration_order.append(current_node)
-            nodes_explored.append(current_node)
-            
-            if self.trace_enabled:
-                print(f"BFS: Exploring {current_node}, Queue size: {len(queue)}")
-            
-            if current_node == goal:
-                total_cost = self.graph.get_path_distance(path)
-                return SearchResult(path, total_cost, nodes_explored, 
-                                  exploration_order, "BFS")
-            
-            # Add neighbors to queue
-            for neighbor, edge_cost in self.graph.get_neighbors(current_node).items():
-                if neighbor not in visited:
-                    new_path = path + [neighbor]
-                    new_cost = cost + edge_cost
-                    queue.append((neighbor, new_path, new_cost))
+        if self.trace_enabled:
+            self._print_trace("BFS: Exploring {}, Queue size: {}", 
+                              zip(exploration_order, order_queue[:count].tolist()))
+        
+        if not found:
+            return SearchResult([], 0, exploration_order, "BFS", False)
         
-        return SearchResult([], 0, nodes_explored, exploration_order, "BFS", False)
+        path = self._reconstruct_path(parent.tolist(), goal_id)
+        return SearchResult(path, self.graph.get_path_distance(path), exploration_order, "BFS")
     
     def depth_first_search(self, start: str, goal: str) -> SearchResult:
         """
@@ -114,46 +559,48 @@ class SearchAlgorithms:
             SearchResult with path and exploration details
         """
         if not self.graph.is_valid_node(start) or not self.graph.is_valid_node(goal):
-            return SearchResult([], 0, [], [], "DFS", False)
+            return SearchResult([], 0, [], "DFS", False)
         
         if start == goal:
-            return SearchResult([start], 0, [start], [start], "DFS")
+            return SearchResult([start], 0, [start], "DFS")
+        
+        indptr, indices_rev, id_to_name = self._indptr, self._indices_rev, self._id_to_name
+        goal_id = self._name_to_id[goal]
         
         # Initialize DFS data structures
-        stack = [(start, [start], 0)]  # (node, path, cost)
-        visited = set()
+        stack = [(self._name_to_id[start], -1)]  # (node id, parent id)
+        visited = [False] * len(id_to_name)
+        parent = [-1] * len(id_to_name)
         exploration_order = []
-        nodes_explored = []
+        trace = [] if self.trace_enabled else None  # (node, stack size), printed when the search ends
         
         while stack:
-            current_node, path, cost = stack.pop()
+            current_id, from_id = stack.pop()
             
-            if current_node in visited:
+            if visited[current_id]:
                 continue
             
-            visited.add(current_node)
+            visited[current_id] = True
+            parent[current_id] = from_id
+            current_node = id_to_name[current_id]
             exploration_order.append(current_node)
-            nodes_explored.append(current_node)
             
-            if self.trace_enabled:
-                print(f"DFS: Exploring {current_node}, Stack size: {len(stack)}")
+            if trace is not None:
+                trace.append((current_node, len(stack)))
             
-            if current_node == goal:
+            if current_id == goal_id:
+                self._print_trace("DFS: Exploring {}, Stack size: {}", trace)
+                path = self._reconstruct_path(parent, goal_id)
                 total_cost = self.graph.get_path_distance(path)
-                return SearchResult(path, total_cost, nodes_explored, 
-                                  exploration_order, "DFS")
+                return SearchResult(path, total_cost, exploration_order, "DFS")
             
             # Add neighbors to stack (reverse order for consistent exploration)
-            neighbors = list(self.graph.get_neighbors(current_node).items())
-            neighbors.reverse()  # For consistent ordering
-            
-            for neighbor, edge_cost in neighbors:
-                if neighbor not in visited:
-                    new_path = path + [neighbor]
-                    new_cost = cost + edge_cost
-                    stack.append((neighbor, new_path, new_cost))
+            for neighbor_id in indices_rev[indptr[current_id]:indptr[current_id + 1]]:
+                if not visited[neighbor_id]:
+                    stack.append((neighbor_id, current_id))
         
-        return SearchResult([], 0, nodes_explored, exploration_order, "DFS", False)
+        self._print_trace("DFS: Exploring {}, Stack size: {}", trace)
+        return SearchResult([], 0, exploration_order, "DFS", False)
     
     def uniform_cost_search(self, start: str, goal: str) -> SearchResult:
         """
@@ -167,43 +614,145 @@ class SearchAlgorithms:
             SearchResult with optimal path and exploration details
         """
         if not self.graph.is_valid_node(start) or not self.graph.is_valid_node(goal):
-            return SearchResult([], 0, [], [], "UCS", False)
+            return SearchResult([], 0, [], "UCS", False)
         
         if start == goal:
-            return SearchResult([start], 0, [start], [start], "UCS")
+            return SearchResult([start], 0, [start], "UCS")
+        
+        goal_id = self._name_to_id[goal]
+        indptr, indices, weights = self._csr
+        parent, order, order_g, order_queue, count, found = _uniform_cost_search(
+            indptr, indices, weights, self._name_to_id[start], goal_id)
+        return self._kernel_result("UCS", goal_id, parent, order[:count], order_g[:count], 
+                                   None, order_queue[:count], found)
+    
+    def bidirectional_uniform_cost_search(self, start: str, goal: str) -> SearchResult:
+        """
+        Bidirectional Uniform Cost Search: Dijkstra from both ends, meeting in the middle.
         
-        # Initialize UCS data structures
-        priority_queue = [(0, start, [start])]  # (cost, node, path)
-        visited = set()
-        exploration_order = []
-        nodes_explored = []
+        Finds the same optimal cost as UCS while expanding roughly half the area. When
+        several routes tie, the one returned may differ from UCS's.
         
-        while priority_queue:
-            current_cost, current_node, path = heapq.heappop(priority_queue)
-            
-            if current_node in visited:
-                continue
-            
-            visited.add(current_node)
-            exploration_order.append(current_node)
-            nodes_explored.append(current_node)
+        Args:
+            start: Starting node name
+            goal: Goal node name
             
-            if self.trace_enabled:
-                print(f"UCS: Exploring {current_node}, Cost: {current_cost}, "
-                      f"Queue size: {len(priority_queue)}")
+        Returns:
+            SearchResult with optimal path and exploration details (both directions,
+            in expansion order)
+        """
+        if not self.graph.is_valid_node(start) or not self.graph.is_valid_node(goal):
+            return SearchResult([], 0, [], "BiUCS", False)
+        
+        if start == goal:
+            return SearchResult([start], 0, [start], "BiUCS")
+        
+        indptr, indices, weights = self._csr
+        (parent_fwd, parent_bwd, meet, best, order, order_dir, order_g, order_queue, 
+         count) = _bidirectional_uniform_cost_search(
+            indptr, indices, weights, self._name_to_id[start], self._name_to_id[goal])
+        
+        exploration_order = [self._id_to_name[i] for i in order[:count].tolist()]
+        # A node can be expanded once from each side
+        num_nodes_explored = len(set(order[:count].tolist()))
+        
+        if self.trace_enabled:
+            directions = ["forward" if d == 0 else "backward" for d in order_dir[:count].tolist()]
+            self._print_trace("BiUCS: Exploring {} ({}), Cost: {}, Queue size: {}", 
+                              zip(exploration_order, directions, order_g[:count].tolist(), 
+                                  order_queue[:count].tolist()))
+        
+        if meet == -1:
+            return SearchResult([], 0, exploration_order, "BiUCS", False, num_nodes_explored)
+        
+        # start ... meet from the forward tree, then meet ... goal from the backward tree
+        path = self._reconstruct_path(parent_fwd.tolist(), meet)
+        node = parent_bwd[meet]
+        while node != -1:
+            path.append(self._id_to_name[node])
+            node = parent_bwd[node]
+        
+        return SearchResult(path, int(best), exploration_order, "BiUCS", True, num_nodes_explored)
+    
+    def _shortest_path_tree(self, start_id: int) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Run UCS from start_id until every reachable node is settled (cached per start).
+        
+        Returns:
+            (parent, order, costs): parent id per node id (-1 for the start and unreached
+            nodes), then the settled node ids in expansion order with their costs
+        """
+        tree = self._tree_cache.get(start_id)
+        if tree is not None:
+            self._tree_cache.move_to_end(start_id)
+            return tree
+        
+        indptr, indices, weights = self._csr
+        parent, order, order_g, _, count, _ = _uniform_cost_search(indptr, indices, weights, start_id, -1)
+        tree = (parent.tolist(), order[:count].tolist(), order_g[:count].tolist())
+        
+        self._tree_cache[start_id] = tree
+        if len(self._tree_cache) > self._tree_cache_size:
+            self._tree_cache.popitem(last=False)
+        return tree
+    
+    def single_source_dijkstra(self, start: str) -> Tuple[Dict[str, int], Dict[str, Optional[str]]]:
+        """
+        Shortest distances and predecessors from start to every reachable node.
+        
+        Args:
+            start: Starting node name
             
-            if current_node == goal:
-                return SearchResult(path, current_cost, nodes_explored, 
-                                  exploration_order, "UCS")
+        Returns:
+            (dist, parent) dictionaries keyed by node name; unreachable nodes are absent
+            and the start's parent is None
+        """
+        parent, order, costs = self._shortest_path_tree(self._name_to_id[start])
+        id_to_name = self._id_to_name
+        dist = {id_to_name[node_id]: cost for node_id, cost in zip(order, costs)}
+        parents = {
+            id_to_name[node_id]: id_to_name[parent[node_id]] if parent[node_id] != -1 else None
+            for node_id in order
+        }
+        return dist, parents
+    
+    def pathfind_many(self, start: str, goals: List[str]) -> Dict[str, SearchResult]:
+        """
+        UCS from one start to several goals, all read off a single search.
+        
+        Each result matches uniform_cost_search(start, goal): UCS expands nodes in the
+        same order whatever the goal, so a goal's exploration order is the prefix of the
+        full run up to it. No trace is printed.
+        
+        Args:
+            start: Starting node name
+            goals: Goal node names
             
-            # Add neighbors to priority queue
-            for neighbor, edge_cost in self.graph.get_neighbors(current_node).items():
-                if neighbor not in visited:
-                    new_cost = current_cost + edge_cost
-                    new_path = path + [neighbor]
-                    heapq.heappush(priority_queue, (new_cost, neighbor, new_path))
+        Returns:
+            Dictionary mapping each goal to its SearchResult
+        """
+        if not self.graph.is_valid_node(start):
+            return {goal: SearchResult([], 0, [], "UCS", False) for goal in goals}
+        
+        parent, order, costs = self._shortest_path_tree(self._name_to_id[start])
+        explored = [self._id_to_name[node_id] for node_id in order]
+        position = {node_id: i for i, node_id in enumerate(order)}
         
-        return SearchResult([], 0, nodes_explored, exploration_order, "UCS", False)
+        results = {}
+        for goal in goals:
+            if not self.graph.is_valid_node(goal):
+                results[goal] = SearchResult([], 0, [], "UCS", False)
+            elif goal == start:
+                results[goal] = SearchResult([start], 0, [start], "UCS")
+            else:
+                goal_id = self._name_to_id[goal]
+                i = position.get(goal_id)
+                if i is None:
+                    results[goal] = SearchResult([], 0, explored, "UCS", False)
+                else:
+                    results[goal] = SearchResult(self._reconstruct_path(parent, goal_id), costs[i], 
+                                                 explored[:i + 1], "UCS")
+        return results
     
     def a_star_search(self, start: str, goal: str) -> SearchResult:
         """
@@ -217,55 +766,45 @@ class SearchAlgorithms:
             SearchResult with optimal path and exploration details
         """
         if not self.graph.is_valid_node(start) or not self.graph.is_valid_node(goal):
-            return SearchResult([], 0, [], [], "A*", False)
+            return SearchResult([], 0, [], "A*", False)
         
         if start == goal:
-            return SearchResult([start], 0, [start], [start], "A*")
+            return SearchResult([start], 0, [start], "A*")
+        
+        goal_id = self._name_to_id[goal]
+        indptr, indices, weights = self._csr
+        parent, order, order_g, order_f, order_queue, count, found = _a_star_search(
+            indptr, indices, weights, self._heuristic_to(goal_id), self._name_to_id[start], goal_id)
+        return self._kernel_result("A*", goal_id, parent, order[:count], order_g[:count], 
+                                   order_f[:count], order_queue[:count], found)
+    
+    def _kernel_result(self, algorithm: str, goal_id: int, parent: np.ndarray, order: np.ndarray, 
+                       order_g: np.ndarray, order_f: Optional[np.ndarray], order_queue: np.ndarray, 
+                       found: bool) -> SearchResult:
+        """
+        Turn the arrays returned by a compiled UCS / A* core into a SearchResult.
         
-        # Initialize A* data structures
-        # (f_cost, g_cost, node, path)
-        priority_queue = [(self.graph.euclidean_distance(start, goal), 0, start, [start])]
-        visited = set()
-        exploration_order = []
-        nodes_explored = []
-        g_costs = {start: 0}  # Track best g-cost to each node
+        The trace is printed from the recorded expansion order once the search returns.
+        """
+        exploration_order = [self._id_to_name[i] for i in order.tolist()]
+        g_costs = order_g.tolist()
+        
+        if self.trace_enabled:
+            queue_sizes = order_queue.tolist()
+            if algorithm == "UCS":
+                self._print_trace("UCS: Exploring {}, Cost: {}, Queue size: {}", 
+                                  zip(exploration_order, g_costs, queue_sizes))
+            else:
+                f_costs = order_f.tolist()
+                h_costs = [f_cost - g_cost for f_cost, g_cost in zip(f_costs, g_costs)]
+                self._print_trace("A*: Exploring {}, g={}, h={:.1f}, f={:.1f}, Queue size: {}", 
+                                  zip(exploration_order, g_costs, h_costs, f_costs, queue_sizes))
         
-        while priority_queue:
-            f_cost, g_cost, current_node, path = heapq.heappop(priority_queue)
-            
-            if current_node in visited:
-                continue
-            
-            visited.add(current_node)
-            exploration_order.append(current_node)
-            nodes_explored.append(current_node)
-            
-            if self.trace_enabled:
-                h_cost = f_cost - g_cost
-                print(f"A*: Exploring {current_node}, g={g_cost}, h={h_cost:.1f}, "
-                      f"f={f_cost:.1f}, Queue size: {len(priority_queue)}")
-            
-            if current_node == goal:
-                return SearchResult(path, g_cost, nodes_explored, 
-                                  exploration_order, "A*")
-            
-            # Add neighbors to priority queue
-            for neighbor, edge_cost in self.graph.get_neighbors(current_node).items():
-                if neighbor not in visited:
-                    new_g_cost = g_cost + edge_cost
-                    
-                    # Skip if we've found a better path to this neighbor
-                    if neighbor in g_costs and g_costs[neighbor] <= new_g_cost:
-                        continue
-                    
-                    g_costs[neighbor] = new_g_cost
-                    h_cost = self.graph.euclidean_distance(neighbor, goal)
-                    f_cost = new_g_cost + h_cost
-                    new_path = path + [neighbor]
-                    
-                    heapq.heappush(priority_queue, (f_cost, new_g_cost, neighbor, new_path))
-        
-        return SearchResult([], 0, nodes_explored, exploration_order, "A*", False)
+        if not found:
+            return SearchResult([], 0, exploration_order, algorithm, False)
+        
+        return SearchResult(self._reconstruct_path(parent.tolist(), goal_id), g_costs[-1], 
+                          exploration_order, algorithm)
     
     def compare_algorithms(self, start: str, goal: str) -> Dict[str, SearchResult]:
         """
@@ -280,32 +819,21 @@ class SearchAlgorithms:
         """
         print(f"\n=== Comparing Algorithms: {start} → {goal} ===")
         
-        # Disable tracing for comparison
-        original_trace = self.trace_enabled
-        self.trace_enabled = False
-        
         results = {}
         
-        # Run all algorithms
-        algorithms = [
-            ("BFS", self.breadth_first_search),
-            ("DFS", self.depth_first_search),
-            ("UCS", self.uniform_cost_search),
-            ("A*", self.a_star_search)
-        ]
-        
-        for name, algorithm in algorithms:
-            print(f"\nRunning {name}...")
-            result = algorithm(start, goal)
-            results[name] = result
-            print(f"{name}: {'Success' if result.success else 'Failed'}")
-            if result.success:
-                print(f"  Path length: {len(result.path)} nodes")
-                print(f"  Total distance: {result.cost}m")
-                print(f"  Nodes explored: {result.num_nodes_explored}")
-        
-        # Restore tracing
-        self.trace_enabled = original_trace
+        # Run all algorithms with tracing disabled (so repeated comparisons come from the cache).
+        # They already share the CSR arrays built in __init__ and A*'s per-goal heuristic row;
+        # they stay sequential because a thread pool's dispatch costs more than the searches
+        with self._tracing(False):
+            for name in ("BFS", "DFS", "UCS", "A*"):
+                print(f"\nRunning {name}...")
+                result = self.search(name, start, goal)
+                results[name] = result
+                print(f"{name}: {'Success' if result.success else 'Failed'}")
+                if result.success:
+                    print(f"  Path length: {len(result.path)} nodes")
+                    print(f"  Total distance: {result.cost}m")
+                    print(f"  Nodes explored: {result.num_nodes_explored}")
         
         return results
     
@@ -349,8 +877,8 @@ class SearchAlgorithms:
 
 # Example usage and testing
 if __name__ == "__main__":
-    # Create campus graph and search algorithms
-    campus = CampusGraph()
+    # Load the campus graph (built and cached on first run) and search algorithms
+    campus = CampusGraph.from_cache()
     search = SearchAlgorithms(campus)
     
     # Test cases
@@ -0,0 +1,8 @@
+"""
+WSGI entry point for production servers.
+
+Usage:
+    gunicorn --chdir backend -k gthread -w ${WEB_CONCURRENCY:-2} --threads 8 --keep-alive 30 --bind 0.0.0.0:${PORT:-5000} --access-logfile - wsgi:app
+"""
+
+from app import app
@@ -23,8 +23,7 @@ Date: September 2025
 import os
 import sys
 import argparse
-import subprocess
-import time
+import importlib.util
 import webbrowser
 import threading
 from pathlib import Path
@@ -39,18 +38,18 @@ def check_requirements():
     required_packages = [
         'flask',
         'flask_cors',
+        'flask_compress',
         'matplotlib',
         'numpy',
         'networkx'
     ]
     
-    missing_packages = []
-    
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    # find_spec only locates the package; importing matplotlib et al. here
+    # would run their initialisation just to check they are installed
+    missing_packages = [
+        package for package in required_packages
+        if importlib.util.find_spec(package) is None
+    ]
     
     if missing_packages:
         print("❌ Missing required packages:")
@@ -62,59 +61,36 @@ def check_requirements():
     return True
 
 def start_backend_server(port=5000, debug=False):
-    """Start the Flask backend server."""
+    """Start the Flask backend server in a background thread of this process.
+
+    The listening socket is bound before this returns, so the server is ready
+    for requests as soon as it hands back the (server, serving thread) pair.
+    """
     print(f"🚀 Starting Chanakya University PathFinder Backend Server on port {port}...")
     
     # Change to backend directory
     os.chdir(backend_path)
     
-    # Set environment variables
-    env = os.environ.copy()
-    env['PORT'] = str(port)
-    env['DEBUG'] = str(debug).lower()
-    env['PYTHONPATH'] = str(backend_path)
-    
     try:
-        # Start Flask server
-        cmd = [sys.executable, "app.py"]
-        process = subprocess.Popen(
-            cmd,
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            bufsize=1
-        )
+        from werkzeug.serving import make_server
+        from app import app
+        
+        app.debug = debug
+        wsgi_app = app
+        if debug:
+            from werkzeug.debug import DebuggedApplication
+            wsgi_app = DebuggedApplication(app, evalex=True)
         
-        return process
+        server = make_server('0.0.0.0', port, wsgi_app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, name="backend-server", daemon=True)
+        thread.start()
+        print("✅ Backend server is ready!")
+        return server, thread
         
     except Exception as e:
         print(f"❌ Error starting backend server: {e}")
         return None
 
-def wait_for_server(port=5000, timeout=30):
-    """Wait for the server to be ready."""
-    import urllib.request
-    import urllib.error
-    
-    url = f"http://localhost:{port}/api/health"
-    start_time = time.time()
-    
-    print("⏳ Waiting for server to be ready...")
-    
-    while time.time() - start_time < timeout:
-        try:
-            response = urllib.request.urlopen(url, timeout=1)
-            if response.getcode() == 200:
-                print("✅ Backend server is ready!")
-                return True
-        except (urllib.error.URLError, urllib.error.HTTPError):
-            pass
-        time.sleep(1)
-    
-    print("⚠️  Server startup timeout")
-    return False
-
 def open_application(port=5000):
     """Open the application in the default web browser."""
     url = f"http://localhost:{port}"
@@ -164,24 +140,17 @@ def run_application(port=5000, debug=False, no_browser=False, backend_only=False
         return False
     
     # Start backend server
-    server_process = start_backend_server(port, debug)
-    if not server_process:
+    started = start_backend_server(port, debug)
+    if not started:
         return False
+    server, server_thread = started
     
     try:
-        # Wait for server to be ready
-        if not wait_for_server(port):
-            print("❌ Failed to start backend server")
-            server_process.terminate()
-            return False
-        
         # Print application information
         print_application_info(port)
         
         # Open browser if requested
         if not no_browser and not backend_only:
-            # Give server a moment to fully initialize
-            time.sleep(2)
             open_application(port)
         
         if backend_only:
@@ -194,21 +163,18 @@ def run_application(port=5000, debug=False, no_browser=False, backend_only=False
         
         # Keep the application running
         try:
-            server_process.wait()
+            # Join with a timeout so Ctrl+C is still delivered to this thread
+            while server_thread.is_alive():
+                server_thread.join(1)
         except KeyboardInterrupt:
             print("\n\n⏹️  Shutting down CU PathFinder...")
-            server_process.terminate()
-            try:
-                server_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                server_process.kill()
+            server.shutdown()
             print("✅ Application stopped successfully")
             return True
             
     except Exception as e:
         print(f"❌ Error running application: {e}")
-        if server_process:
-            server_process.terminate()
+        server.shutdown()
         return False
 
 def main():
@@ -236,7 +202,7 @@ Examples:
     parser.add_argument(
         '--debug', '-d',
         action='store_true',
-        help='Run in debug mode with auto-reload'
+        help='Run in debug mode'
     )
     
     parser.add_argument(